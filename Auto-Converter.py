@@ -1,16 +1,31 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, font
 import pandas as pd
+import numpy as np
 from docx import Document
+from docx.oxml.ns import qn
 from docx.shared import Inches
+from docx.oxml import OxmlElement
+from docx.table import Table, _Cell
+from docx.text.paragraph import Paragraph
 import re
 import os
+import string
+from collections.abc import Mapping
 from pathlib import Path
 import zipfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 import threading
-from functools import lru_cache
+import queue
+import multiprocessing
 import copy
+import contextlib
+import io
+import hashlib
+import importlib.util
+import pickle
+import shutil
 from datetime import datetime
 
 
@@ -39,11 +54,1317 @@ class ModernStyle:
     BUTTON_DISABLED = "#CBD5E1"  # Light gray for disabled state
 
 
+class CompiledTemplate:
+    """Word template parsed once per run and cloned in memory for every row"""
+
+    # Fast mode: {name} inside serialized XML text, never spanning a tag
+    RAW_PLACEHOLDER_PATTERN = re.compile(rb'\{([^{}<>]+)\}')
+    INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+    LINE_BREAKS = re.compile('[\r\n]')
+
+    def __init__(self, template_path):
+        self.template_path = template_path
+        with open(template_path, 'rb') as f:
+            template_bytes = f.read()
+
+        # Identifies the template contents for the on-disk TemplateCache
+        self.content_hash = hashlib.sha256(template_bytes).hexdigest()
+
+        # Pristine parse that is only ever cloned. It must not be inspected: python-docx
+        # caches proxies of inner elements that deepcopy would detach from the tree
+        self._source = Document(io.BytesIO(template_bytes))
+
+        # Only the main document part is modified while rendering a row, so every
+        # other part (styles, numbering, theme, headers...) is shared by the clones
+        main_part = self._source.part
+        self._shared_parts = {id(part): part for part in main_part.package.iter_parts()
+                              if part is not main_part}
+        self._clone_lock = threading.Lock()
+
+        # Working copy used for scanning the template
+        self.document = self.new_document()
+
+        # Set when the template qualifies for the raw-XML fast mode
+        self.fast_render_ready = False
+
+        # (role, path) of every node a row has to visit, in render order, filled at
+        # template load. Roles: 'paragraph', 'bus_table', 'bus_paragraph' (inside a
+        # bus_info_needs table) and 'table' (dynamic table, after its own content)
+        self.placeholder_index = []
+
+        # Dynamic table kind (see classify_dynamic_table) by table path
+        self.table_kinds = {}
+
+        # Blank data rows cloned by TableFiller, built on first use per table path
+        self._row_prototypes = {}
+        self._prototype_lock = threading.Lock()
+
+    def get_cache_state(self):
+        """Everything derived from scanning the template, for the TemplateCache"""
+        state = {'placeholder_index': self.placeholder_index, 'table_kinds': self.table_kinds,
+                 'fast_render': None}
+        if self.fast_render_ready:
+            state['fast_render'] = (self._package_entries, self._document_name, self._document_xml,
+                                    self._slot_texts)
+        return state
+
+    def restore_cache_state(self, state):
+        """Reuse the scan results of a previous run instead of scanning the template again"""
+        self.placeholder_index = state['placeholder_index']
+        self.table_kinds = state['table_kinds']
+        if state['fast_render'] is not None:
+            (self._package_entries, self._document_name, self._document_xml,
+             self._slot_texts) = state['fast_render']
+            self.fast_render_ready = True
+
+    def new_document(self):
+        """Return an independent copy of the parsed template for one row"""
+        # Seeding the deepcopy memo makes the shared parts resolve to themselves
+        memo = dict(self._shared_parts)
+        with self._clone_lock:
+            return copy.deepcopy(self._source, memo)
+
+    def element_path(self, element):
+        """Child positions leading from the document body to an element"""
+        body = self.document.element.body
+        path = []
+        while element is not body:
+            parent = element.getparent()
+            path.append(parent.index(element))
+            element = parent
+        return tuple(reversed(path))
+
+    def prepare_fast_render(self):
+        """Build the raw-XML skeleton used by fast mode; False if the template cannot use it
+
+        Every placeholder paragraph gets the single-run layout that setting
+        paragraph.text produces anyway, holding one numbered {slot} marker in
+        place of its text. A row renders each slot's original text with
+        PlaceholderEngine, exactly like the regular path, and substitutes the
+        result into the serialized XML.
+        """
+        skeleton = self.new_document()
+        slot_texts = []
+        for role, paragraph in self.locate_placeholders(skeleton):
+            if role != 'paragraph':
+                return False
+            text = paragraph.text
+            if not PlaceholderEngine.LEFTOVER_PATTERN.search(text):
+                continue  # Never rewritten by the regular path either
+            paragraph.text = f"{{{len(slot_texts)}}}"
+            slot_texts.append(text)
+            # Values may add leading/trailing spaces
+            for t in paragraph._p.iter(qn('w:t')):
+                t.set(qn('xml:space'), 'preserve')
+
+        buffer = io.BytesIO()
+        skeleton.save(buffer)
+        document_name = skeleton.part.partname.lstrip('/')
+        entries = []
+        with zipfile.ZipFile(buffer) as package:
+            for info in package.infolist():
+                entries.append((info.filename, info.compress_type, package.read(info.filename)))
+        document_xml = next(data for name, _, data in entries if name == document_name)
+
+        # Placeholders outside the indexed paragraphs (text boxes, content controls...)
+        # are not touched by the regular path, so such templates are not eligible
+        if len(self.RAW_PLACEHOLDER_PATTERN.findall(document_xml)) != len(slot_texts):
+            return False
+
+        self._package_entries = entries
+        self._document_name = document_name
+        self._document_xml = document_xml
+        self._slot_texts = slot_texts
+        return True
+
+    def render_fast(self, values):
+        """Render one row from the raw-XML skeleton and return the .docx bytes"""
+        # Whole paragraph texts go through the same substitute-then-clear step as
+        # the regular path, so text that forms a new {...} is cleared there too
+        engine = PlaceholderEngine(values)
+        slots = [self._xml_text(engine.render(text)).encode('utf-8') for text in self._slot_texts]
+        document_xml = self.RAW_PLACEHOLDER_PATTERN.sub(
+            lambda match: slots[int(match.group(1))], self._document_xml)
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as package:
+            for name, compress_type, data in self._package_entries:
+                if name == self._document_name:
+                    data = document_xml
+                package.writestr(zipfile.ZipInfo(name, (1980, 1, 1, 0, 0, 0)), data, compress_type)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _xml_escape(text):
+        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+    @classmethod
+    def _xml_text(cls, text):
+        """Escape a value for a <w:t>, mapping tabs and line breaks like python-docx does"""
+        text = cls.INVALID_XML_CHARS.sub('', cls._xml_escape(text))
+        text = text.replace('\t', '</w:t><w:tab/><w:t xml:space="preserve">')
+        return cls.LINE_BREAKS.sub('</w:t><w:br/><w:t xml:space="preserve">', text)
+
+    def row_prototype(self, path, header_rows):
+        """Blank <w:tr> for the data rows of the dynamic or bus_info_needs table at path
+
+        Prototypes are per table, not per kind: two tables of one kind may
+        have different column counts and formatting.
+        """
+        key = (tuple(path), header_rows)
+        prototype = self._row_prototypes.get(key)
+        if prototype is None:
+            with self._prototype_lock:
+                prototype = self._row_prototypes.get(key)
+                if prototype is None:
+                    # Built from the unrendered scanning copy so run formatting is intact
+                    element = self.document.element.body[path[0]]
+                    for position in path[1:]:
+                        element = element[position]
+                    prototype = TableFiller.build_prototype(element, header_rows)
+                    self._row_prototypes[key] = prototype
+        return prototype
+
+    def locate_placeholders(self, document):
+        """Resolve the indexed placeholder nodes inside a cloned document"""
+        # Resolve everything up front: later stages add and remove table rows,
+        # which would shift the recorded positions
+        body_items = list(document.element.body)
+        container = document._body
+        located = []
+        for role, path in self.placeholder_index:
+            element = body_items[path[0]]
+            for position in path[1:]:
+                element = element[position]
+            if role == 'table':
+                located.append((role, (self.table_kinds[tuple(path)], path, Table(element, container))))
+            elif role == 'bus_table':
+                located.append((role, (path, Table(element, container))))
+            else:
+                located.append((role, Paragraph(element, container)))
+        return located
+
+
+class ExcelReader:
+    """Single entry point for reading survey exports (Excel workbooks or CSV)
+
+    Workbooks are parsed with the calamine engine when python-calamine is
+    installed (several times faster than openpyxl), otherwise with the pandas
+    default. CSV exports are read directly.
+    """
+
+    CSV_SUFFIXES = ('.csv',)
+
+    @staticmethod
+    def excel_engine():
+        """Name of the pandas Excel engine in use (None = pandas default)"""
+        if importlib.util.find_spec('python_calamine') is not None:
+            return 'calamine'
+        return None
+
+    @classmethod
+    def engine_for(cls, file_path):
+        if Path(file_path).suffix.lower() in cls.CSV_SUFFIXES:
+            return 'csv'
+        return cls.excel_engine() or 'default'
+
+    @classmethod
+    def read(cls, file_path, **read_options):
+        """Read the first sheet (or the CSV file) into a DataFrame, like pd.read_excel()"""
+        if Path(file_path).suffix.lower() in cls.CSV_SUFFIXES:
+            # Infer each column's type from the whole file, not per chunk
+            read_options.setdefault('low_memory', False)
+            return pd.read_csv(file_path, **read_options)
+        engine = cls.excel_engine()
+        if engine:
+            read_options.setdefault('engine', engine)
+        return pd.read_excel(file_path, **read_options)
+
+
+class RuntimeConfig:
+    """Engine settings shared by the tabs and edited in the Settings tab
+
+    "Auto" sizes the worker count from the CPU cores and free RAM, and picks
+    the memory level (tasks in flight, on-disk cache limits) from free RAM.
+    """
+
+    AUTO = "Auto"
+    MEMORY_CHOICES = (AUTO, "Low", "Medium", "High")
+    # Memory level -> (rendering tasks in flight per worker, size limit per cache folder)
+    MEMORY_LEVELS = {
+        "Low": (1, 256 * 2 ** 20),
+        "Medium": (4, 1024 * 2 ** 20),
+        "High": (16, 4096 * 2 ** 20),
+    }
+    # Rough footprint of one rendering process besides its render state: interpreter,
+    # parsed template, buffers
+    WORKER_MEMORY = 256 * 2 ** 20
+    # Unpickled render state (mostly the additional-data index) takes ~5x its pickled size
+    STATE_EXPANSION = 6
+    # Threads share the GIL, so more than a few only add contention
+    MAX_AUTO_THREADS = 4
+    # ProcessPoolExecutor refuses more workers than this on Windows
+    MAX_WINDOWS_PROCESSES = 61
+    # ZIP compression choice -> (method, level); .docx files are already deflated,
+    # so storing them costs ~1% in size and saves all the compression time
+    ZIP_COMPRESSION = {
+        "None (fastest)": (zipfile.ZIP_STORED, None),
+        "Fast": (zipfile.ZIP_DEFLATED, 1),
+        "Normal": (zipfile.ZIP_DEFLATED, 6),
+        "Maximum": (zipfile.ZIP_DEFLATED, 9),
+    }
+    DEFAULT_ZIP_COMPRESSION = "None (fastest)"
+    OUTPUT_FORMATS = ("Individual + ZIP", "ZIP Only", "Individual Only")
+    DEFAULT_OUTPUT_FORMAT = "Individual + ZIP"
+    # Archive split choice -> None (one ZIP), ('column', header) or ('count', documents per ZIP)
+    ARCHIVE_SPLITS = {
+        "Single ZIP": None,
+        "Per barangay (pckg_brgy)": ('column', 'pckg_brgy'),
+        "Every 500 documents": ('count', 500),
+        "Every 2000 documents": ('count', 2000),
+    }
+    DEFAULT_ARCHIVE_SPLIT = "Single ZIP"
+
+    def __init__(self):
+        self.threads = self.AUTO
+        self.memory = self.AUTO
+        self.zip_compression = self.DEFAULT_ZIP_COMPRESSION
+        self.output_format = self.DEFAULT_OUTPUT_FORMAT
+        self.archive_split = self.DEFAULT_ARCHIVE_SPLIT
+        self.apply()
+
+    def set_threads(self, value):
+        """Set the worker count from the settings text; anything but a positive number means Auto"""
+        try:
+            self.threads = max(1, int(value))
+        except (TypeError, ValueError):
+            self.threads = self.AUTO
+
+    def set_memory(self, value):
+        self.memory = value if value in self.MEMORY_LEVELS else self.AUTO
+        self.apply()
+
+    def set_zip_compression(self, value):
+        self.zip_compression = value if value in self.ZIP_COMPRESSION else self.DEFAULT_ZIP_COMPRESSION
+
+    def set_output_format(self, value):
+        self.output_format = value if value in self.OUTPUT_FORMATS else self.DEFAULT_OUTPUT_FORMAT
+
+    def set_archive_split(self, value):
+        self.archive_split = value if value in self.ARCHIVE_SPLITS else self.DEFAULT_ARCHIVE_SPLIT
+
+    def archive_split_rule(self):
+        return self.ARCHIVE_SPLITS[self.archive_split]
+
+    def writes_individual_files(self):
+        return self.output_format != "ZIP Only"
+
+    def writes_zip(self):
+        return self.output_format != "Individual Only"
+
+    def zip_options(self):
+        """(compression method, compresslevel) for output archives"""
+        return self.ZIP_COMPRESSION[self.zip_compression]
+
+    @staticmethod
+    def available_memory():
+        """Free physical memory in bytes, or None when it cannot be determined"""
+        if importlib.util.find_spec('psutil') is not None:
+            import psutil
+            return psutil.virtual_memory().available
+        if os.name == 'nt':
+            import ctypes
+
+            class MemoryStatus(ctypes.Structure):
+                _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                            ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                            ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                            ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                            ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+
+            status = MemoryStatus()
+            status.dwLength = ctypes.sizeof(MemoryStatus)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return status.ullAvailPhys
+            return None
+        try:
+            return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+        except (AttributeError, ValueError, OSError):
+            return None
+
+    def memory_level(self):
+        if self.memory != self.AUTO:
+            return self.memory
+        available = self.available_memory()
+        if available is None:
+            return "Medium"
+        if available < 4 * 2 ** 30:
+            return "Low"
+        if available < 16 * 2 ** 30:
+            return "Medium"
+        return "High"
+
+    def worker_count(self, processes=False, state_size=0):
+        """Number of rendering threads, or of worker processes when processes is True
+
+        state_size is the pickled size of what every process receives at start-up.
+        """
+        if not processes:
+            if self.threads != self.AUTO:
+                return self.threads
+            return min(self.MAX_AUTO_THREADS, os.cpu_count() or 1)
+        count = self._process_count(state_size)
+        if os.name == 'nt':
+            count = min(count, self.MAX_WINDOWS_PROCESSES)
+        return count
+
+    def _process_count(self, state_size):
+        if self.threads != self.AUTO:
+            return self.threads
+        cores = os.cpu_count() or 1
+        # Every process holds its own copy of the template and additional data
+        available = self.available_memory()
+        if available is None:
+            return cores
+        per_worker = self.WORKER_MEMORY + self.STATE_EXPANSION * state_size
+        return max(1, min(cores, available // per_worker))
+
+    def single_process_reason(self, state_size):
+        """Why worker_count(processes=True) allows only one process"""
+        if self.threads != self.AUTO:
+            return f"Processing Threads is set to {self.threads}"
+        if (os.cpu_count() or 1) < 2:
+            return "this machine has a single CPU core"
+        return (f"render state is {state_size / 2 ** 20:.0f} MB, "
+                f"too large for more than one worker process in free RAM")
+
+    def tasks_per_worker(self):
+        return self.MEMORY_LEVELS[self.memory_level()][0]
+
+    def cache_size_limit(self):
+        return self.MEMORY_LEVELS[self.memory_level()][1]
+
+    def apply(self):
+        """Push the settings that live outside this object"""
+        DiskCache.size_limit = self.cache_size_limit()
+
+
+class DiskCache:
+    """Versioned pickle entries in a folder of the local cache directory"""
+
+    CACHE_ROOT = Path(os.environ.get('LOCALAPPDATA') or Path.home() / '.cache') / 'AutoConverterPro'
+    CACHE_DIR = CACHE_ROOT
+    NAME = "cache"
+
+    # Bump when the cached state changes shape so stale entries are ignored
+    VERSION = 1
+
+    # Bytes kept per cache folder (None = unlimited), set by RuntimeConfig
+    size_limit = None
+
+    @classmethod
+    def _entry_path(cls, key):
+        return cls.CACHE_DIR / f"{key}.pkl"
+
+    @classmethod
+    def load(cls, key):
+        """Return the cached state for a key, or None"""
+        path = cls._entry_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            if entry.get('version') == cls.VERSION:
+                # Mark as recently used for pruning
+                os.utime(path)
+                return entry['state']
+        except Exception as e:
+            print(f"Ignoring unreadable {cls.NAME} entry {path.name}: {e}")
+        return None
+
+    @classmethod
+    def store(cls, key, state):
+        try:
+            cls.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Write then rename so a concurrent reader never sees a partial file
+            path = cls._entry_path(key)
+            temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_path, 'wb') as f:
+                pickle.dump({'version': cls.VERSION, 'state': state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+            cls._prune(keep=path)
+        except Exception as e:
+            print(f"Error writing {cls.NAME}: {e}")
+
+    @classmethod
+    def _prune(cls, keep):
+        """Delete least recently used entries until the folder fits size_limit"""
+        if cls.size_limit is None:
+            return
+        entries = []
+        for path in cls.CACHE_DIR.glob('*.pkl'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= cls.size_limit:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    @classmethod
+    def clear(cls):
+        """Delete every entry and return how many were removed"""
+        if not cls.CACHE_DIR.exists():
+            return 0
+        count = len(list(cls.CACHE_DIR.glob('*.pkl')))
+        shutil.rmtree(cls.CACHE_DIR, ignore_errors=True)
+        return count
+
+
+class TemplateCache(DiskCache):
+    """On-disk cache of template scan results
+
+    Entries are keyed by the template's content hash together with the table
+    rules used to classify it, so editing TABLE_SPECS or the bus_info_needs
+    markers rescans templates instead of reusing their old classification.
+    """
+
+    CACHE_DIR = DiskCache.CACHE_ROOT / 'templates'
+    NAME = "template cache"
+    VERSION = 3
+
+    @staticmethod
+    def key_for(content_hash):
+        rules = repr((TABLE_SPECS, BUS_INFO_NEEDS_MARKERS))
+        return hashlib.sha256(f"{content_hash}|{rules}".encode('utf-8')).hexdigest()
+
+
+class ExcelCache(DiskCache):
+    """On-disk cache of parsed workbooks, so unchanged files skip the Excel parse
+
+    Entries are keyed by path and read options and validated against the
+    file's size and mtime; when only the mtime changed, the content hash
+    decides whether the parsed sheet is still valid.
+    """
+
+    CACHE_DIR = DiskCache.CACHE_ROOT / 'data'
+    NAME = "data cache"
+    VERSION = 1
+
+    @staticmethod
+    def _file_hash(file_path):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def read(cls, file_path, **read_options):
+        """ExcelReader.read() through the cache"""
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        # The engine is part of the key: engines may type some cells differently
+        key_text = f"{file_path}|{ExcelReader.engine_for(file_path)}|{sorted(read_options.items())}"
+        key = hashlib.sha256(key_text.encode('utf-8')).hexdigest()
+
+        cached = cls.load(key)
+        if cached is not None and cached['size'] == stat.st_size:
+            if cached['mtime'] == stat.st_mtime_ns:
+                return cached['df']
+            content_hash = cls._file_hash(file_path)
+            if cached['sha256'] == content_hash:
+                # Touched but unchanged: remember the new mtime
+                cls.store(key, dict(cached, mtime=stat.st_mtime_ns))
+                return cached['df']
+        else:
+            content_hash = None
+
+        df = ExcelReader.read(file_path, **read_options)
+        cls.store(key, {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'sha256': content_hash or cls._file_hash(file_path),
+            'df': df,
+        })
+        return df
+
+
+class BackgroundWriter:
+    """Writes in-memory files from one dedicated thread
+
+    Producers hand over (name, bytes) with add(); the queue is bounded so
+    finished documents cannot pile up faster than they are written. Use as a
+    context manager: leaving it writes the remaining files and finalizes the
+    output. Subclasses set their attributes before calling __init__ and
+    implement _start(), _write() and _finish().
+    """
+
+    _DONE = object()
+
+    def __init__(self, max_pending=64):
+        self.count = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        done = False
+        try:
+            self._start()
+            try:
+                while True:
+                    item = self._queue.get()
+                    if item is self._DONE:
+                        done = True
+                        break
+                    self._write(*item)
+                    self.count += 1
+            finally:
+                self._finish()
+        except Exception as e:
+            self._error = e
+            # Keep draining so producers never block on a dead writer; once
+            # _DONE has been taken (e.g. _finish() failed) nothing more arrives
+            while not done:
+                done = self._queue.get() is self._DONE
+
+    def _start(self):
+        pass
+
+    def _write(self, name, data):
+        raise NotImplementedError
+
+    def _finish(self):
+        pass
+
+    def add(self, name, data):
+        self._queue.put((name, data))
+
+    def finish(self):
+        """Accept no more files; the thread writes what is queued and finalizes on its own"""
+        if not self._finished:
+            self._finished = True
+            self._queue.put(self._DONE)
+
+    def close(self):
+        """Wait for every queued file to be written; re-raises a write error"""
+        self.finish()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class ZipWriter(BackgroundWriter):
+    """Appends in-memory files to a ZIP archive as they arrive"""
+
+    def __init__(self, zip_path, compression=zipfile.ZIP_STORED, compresslevel=None, max_pending=64):
+        self.zip_path = zip_path
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self._zipf = None
+        super().__init__(max_pending)
+
+    def _start(self):
+        self._zipf = zipfile.ZipFile(self.zip_path, 'w', self.compression, compresslevel=self.compresslevel)
+
+    def _write(self, name, data):
+        self._zipf.writestr(name, data)
+
+    def _finish(self):
+        if self._zipf is not None:
+            self._zipf.close()
+
+
+class FolderWriter(BackgroundWriter):
+    """Saves in-memory files straight into a folder"""
+
+    def __init__(self, folder, max_pending=64):
+        self.folder = Path(folder)
+        super().__init__(max_pending)
+
+    def _start(self):
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+    def _write(self, name, data):
+        (self.folder / name).write_bytes(data)
+
+
+class ArchiveSet:
+    """Output ZIP archives split by group, each built by its own ZipWriter thread
+
+    expected maps each group to its number of documents (None is the single
+    unsplit archive). An archive is finalized as soon as all of its documents
+    are in, so finished groups can be handed off while the rest still render.
+    """
+
+    def __init__(self, folder, base_name, expected, compression=zipfile.ZIP_STORED, compresslevel=None,
+                 max_pending=64):
+        self.folder = Path(folder)
+        self.base_name = base_name
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.max_pending = max_pending
+        self.paths = []
+        self._remaining = dict(expected)
+        self._writers = {}
+        self._closed = []
+
+    def archive_path(self, group):
+        if group is None:
+            return self.folder / f"{self.base_name}.zip"
+        return self.folder / f"{self.base_name}_{group}.zip"
+
+    def add(self, group, name, data):
+        writer = self._writers.get(group)
+        if writer is None:
+            path = self.archive_path(group)
+            writer = ZipWriter(path, self.compression, self.compresslevel, max_pending=self.max_pending)
+            self._writers[group] = writer
+            self.paths.append(path)
+        writer.add(name, data)
+        self._count(group)
+
+    def skip(self, group):
+        """A document of this group failed; it still counts towards finishing the group"""
+        self._count(group)
+
+    def _count(self, group):
+        remaining = self._remaining.get(group)
+        if remaining is None:
+            return
+        self._remaining[group] = remaining - 1
+        if remaining == 1:
+            writer = self._writers.pop(group, None)
+            if writer is not None:
+                writer.finish()
+                self._closed.append(writer)
+
+    def close(self):
+        """Finalize every archive still open and wait for all of them"""
+        writers = self._closed + list(self._writers.values())
+        self._writers.clear()
+        for writer in writers:
+            writer.finish()
+        errors = []
+        for writer in writers:
+            try:
+                writer.close()
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class TableFiller:
+    """Fills a dynamic table by cloning a blank prototype row once per data row
+
+    The template's data rows are dropped, new rows are collected with add_row()
+    and attached to the table in one go by finish().
+    """
+
+    def __init__(self, table, prototype, header_rows):
+        self.table = table
+        self._tbl = table._tbl
+        self._prototype = prototype
+        self._new_rows = []
+
+        self.reset_rows(self._tbl, header_rows)
+
+    @staticmethod
+    def reset_rows(tbl, header_rows):
+        """Keep the header rows and remove all data rows in one pass"""
+        # tr_lst is collected once; removing rows through table.rows rebuilds the
+        # row proxies on every iteration
+        for tr in tbl.tr_lst[header_rows:]:
+            tbl.remove(tr)
+
+    @staticmethod
+    def build_prototype(tbl, header_rows):
+        """Blank copy of the template's first data row, or an add_row()-style row"""
+        grid_widths = [gridCol.w for gridCol in tbl.tblGrid.gridCol_lst]
+        rows = tbl.tr_lst
+
+        # Only a plain row (one cell per grid column) keeps cell indexes aligned
+        # with what row.cells returned for add_row()
+        if len(rows) > header_rows and len(rows[header_rows].tc_lst) == len(grid_widths):
+            prototype = copy.deepcopy(rows[header_rows])
+            for tc in prototype.tc_lst:
+                tcPr = tc.tcPr
+                if tcPr is not None:
+                    tcPr._remove_vMerge()
+
+                # One paragraph holding one empty run, keeping the first run's formatting
+                first_p = tc.p_lst[0] if tc.p_lst else None
+                first_r = first_p.r_lst[0] if first_p is not None and first_p.r_lst else None
+                run = OxmlElement('w:r')
+                if first_r is not None and first_r.rPr is not None:
+                    run.append(copy.deepcopy(first_r.rPr))
+                paragraph = OxmlElement('w:p')
+                if first_p is not None and first_p.pPr is not None:
+                    paragraph.append(copy.deepcopy(first_p.pPr))
+                paragraph.append(run)
+
+                tc.clear_content()
+                tc.append(paragraph)
+        else:
+            prototype = tbl._new_tr()
+            for width in grid_widths:
+                tc = prototype.add_tc()
+                if width is not None:
+                    tc.width = width
+                tc.p_lst[0].add_r()
+        return prototype
+
+    def add_row(self):
+        """Queue a new data row and return its cells; set cell.text to fill them"""
+        tr = copy.deepcopy(self._prototype)
+        self._new_rows.append(tr)
+        return [FillerCell(tc, run, self.table) for tc, run in zip(tr.tc_lst, tr.iter(qn('w:r')))]
+
+    def finish(self):
+        """Attach all queued rows to the table"""
+        self._tbl.extend(self._new_rows)
+        self._new_rows = []
+
+
+class FillerCell:
+    """Cell of a TableFiller row; text is written into the prototype's formatted run"""
+
+    __slots__ = ('_tc', '_run', '_table')
+
+    def __init__(self, tc, run, table):
+        self._tc = tc
+        self._run = run
+        self._table = table
+
+    @property
+    def text(self):
+        return self._run.text
+
+    @text.setter
+    def text(self, text):
+        self._run.text = text
+
+    @property
+    def cell(self):
+        """python-docx cell, for content other than plain text"""
+        return _Cell(self._tc, self._table)
+
+
+# Dynamic tables of the survey templates, in classification order. Each kind names
+# the header text that identifies it (`markers`, plus `lower_markers` matched
+# case-insensitively), the additional-data category it lists, how many header rows
+# are kept and one binding per column:
+#   'field'                              value of a field
+#   ('index',)                           1-based row number
+#   ('specify', field, other, separator) "value<separator>other" when other is filled
+#   ('format', template[, strip])        str.format-style template over the fields,
+#                                        optionally stripped of the `strip` characters
+#   ('parts', separator, pieces)         filled pieces joined; a piece is (template,
+#                                        condition field or None to test the text itself)
+#   ('keyword', all_of, any_of, none_of) first field whose name matches, tested per
+#                                        field in column order (for converted groups)
+#   ('images', width)                    Pix1-Pix10 pictures
+# Additional-data rows are sorted into a spec's category by their column names:
+# 'row_contains' (lowercase substrings) rules are tried before 'row_prefixes'
+# rules, each in spec order. Specs sharing a category need only one rule.
+TABLE_SPECS = {
+    'hh_member': {
+        'markers': ("Name of HH Member",),
+        'category': 'hh_member',
+        'row_prefixes': ('hhcomp_hhmmbr_',),
+        'header_rows': 2,
+        'columns': [
+            ('index',),
+            ('format', "{hhcomp_hhmmbr_fname} {hhcomp_hhmmbr_mname} {hhcomp_hhmmbr_lname}", None),
+            'hhcomp_hhmmbr_hhreltn',
+            'hhcomp_hhmmbr_hhage',
+            'hhcomp_hhmmbr_hhsex',
+            'hhcomp_hhmmbr_status',
+            ('specify', 'hhcomp_hhmmbr_relg', 'hhcomp_hhmmbr_relg_o', " Pls. Specify: "),
+            'hhcomp_hhmmbr_brtplc',
+            'hhcomp_hhmmbr_educ',
+            'hhcomp_hhmmbr_ethn',
+        ],
+    },
+    'savings': {
+        'markers': ("Ownership of at least one savings account",),
+        'category': 'hh_member',
+        'header_rows': 1,
+        'columns': [
+            ('index',),
+            'hhcomp_hhmmbr_ethn',
+            ('specify', 'hhcomp_hhmmbr_savings', 'hhcomp_hhmmbr_savings_o', " Pls. Specify "),
+            'hhcomp_hhmmbr_phone',
+            ('specify', 'hhcomp_hhmmbr_org', 'hhcomp_hhmmbr_org_o', " Pls. Specify "),
+            'hhcomp_hhmmbr_org_mem',
+            'hhcomp_hhmmbr_disability',
+        ],
+    },
+    'labor': {
+        'markers': ("Labor Force Status",),
+        'category': 'labor',
+        'row_prefixes': ('hh_labor_', 'hh_wrk_', 'hh_calc_', 'hh_total_'),
+        'header_rows': 3,
+        'columns': [
+            ('index',),
+            'hh_labor_stat',
+            ('specify', 'hh_labor_pri_src', 'hh_labor_pri_src_o', " Pls. Specify "),
+            'hh_labor_pri_industry',
+            'hh_labor_pri_plc_work',
+            'hh_labor_pri_inc',
+            'hh_labor_occ_other',
+            'hh_labor_other_industry',
+            'hh_labor_occ_other_plc_wrk',
+            'hh_labor_occ_other_inc',
+            'hh_calc_total_inc',
+            'hh_wrk_hrs',
+        ],
+    },
+    'debt': {
+        'markers': ("With formal loan contract? (Y/N)",),
+        'category': 'debt',
+        'row_prefixes': ('debt_', 'loan_', 'pymt_'),
+        'header_rows': 1,
+        'columns': [
+            ('specify', 'debt_src_name', 'debt_src_name_o', " Pls. Specify "),
+            'debt_contract',
+            'debt_contract_y',
+            'debt_amt',
+            ('specify', 'loan_used', 'loan_used_o', " Pls. Specify "),
+            ('format', "{pymt_terms}{pymt_terms_int}{pymt_terms_amt}, {pymt_terms_long}"),
+            'debt_balance',
+            'debt_fam_proc',
+            'debt_fam_payment',
+        ],
+    },
+    'land': {
+        'markers': ("13.1 Affected Assets: Land", "10.0 Affected Assets: Land"),
+        'category': 'land',
+        'row_prefixes': ('asset_land_',),
+        'header_rows': 2,
+        'columns': [
+            ('index',),
+            'asset_land_area',
+            'asset_land_area_aff',
+            'asset_land_ext_impact',
+            'asset_land_type',
+            ('specify', 'asset_land_use', 'asset_land_use_o', ", Please Specify "),
+            ('specify', 'asset_land_tenure_owner', 'asset_land_tenure_owner_o', ", Please Specify "),
+            ('specify', 'asset_land_proof_owner', 'asset_land_proof_owner_o', ", Please Specify "),
+            'asset_land_yrs_used',
+            'asset_land_price_prch',
+            ('specify', 'asset_land_pymnt_trms', 'asset_land_pymnt_trms_o', ", Please Specify "),
+            'asset_land_pymnt_amt',
+        ],
+    },
+    'struct': {
+        'markers': ("13.2 Affected Assets: Structure", "10.2 Affected Assets: Structure"),
+        'category': 'struct',
+        'row_prefixes': ('asset_struct_',),
+        'header_rows': 2,
+        'columns': [
+            ('index',),
+            'asset_struct_area',
+            'asset_struct_area_aff',
+            'asset_struct_ext_impact',
+            ('parts', ", ", [("{asset_struct_type}", None),
+                             ("Please Specify {asset_struct_type_oth}", 'asset_struct_type_oth'),
+                             ("{asset_struct_type_oth}", 'asset_struct_type_oth_o')]),
+            ('specify', 'asset_struct_use', 'asset_struct_use_o', ", Please Specify "),
+            ('specify', 'asset_struct_tenure_owner', 'asset_struct_tenure_owner_o', ", Please Specify "),
+            ('specify', 'asset_struct_proof_owner', 'asset_struct_proof_owner_o', ", Please Specify "),
+            'asset_struct_yrs_used',
+            'asset_struct_price_prch',
+            ('specify', 'asset_struct_pymnt_trms', 'asset_struct_pymnt_trms_o', ", Please Specify "),
+            'asset_struct_pymnt_amt',
+            'asset_struct_mrkt_val',
+        ],
+    },
+    'affected_struct': {
+        'markers': ("13.3 Affected Structure", "10.3 Affected Structure"),
+        'category': 'affected_struct',
+        'row_prefixes': ('affctd_struct_',),
+        'header_rows': 2,
+        'columns': [
+            ('specify', 'affctd_struct_type_zz', 'affctd_struct_type_zz_o', ", Please Specify "),
+            'affctd_struct_mtrl_type',
+            'affctd_struct_dimension',
+            ('parts', ", ", [("{affctd_struct_unit}", None), ("{affctd_struct_ht}", None)]),
+            'affctd_struct_estvalue',
+            'affctd_struct_totalcost',
+            ('images', 1.5),
+        ],
+    },
+    'tree': {
+        'markers': ("13.4 Trees", "10.4 Trees"),
+        'category': 'tree',
+        'row_prefixes': ('tree_',),
+        'header_rows': 1,
+        'columns': [
+            'tree_type',
+            ('format', "{tree_age}, {tree_height}", ", "),
+            'tree_qty',
+            'tree_price',
+            'tree_totalcost',
+        ],
+    },
+    'crop': {
+        'markers': ("13.5 Crops", "10.5 Crops"),
+        'lower_markers': ("crops_grp_converted",),
+        'category': 'crop',
+        'row_contains': ('crop',),
+        'header_rows': 1,
+        'columns': [
+            ('keyword', ('crop', 'type'), (), ()),
+            ('keyword', ('crop', 'age'), (), ()),
+            ('keyword', ('crop', 'area'), (), ()),
+            ('keyword', ('crop', 'price'), (), ()),
+            ('keyword', ('crop',), ('total', 'cost'), ()),
+        ],
+    },
+    'income_loss': {
+        'markers': ("13.6 Income Loss", "10.6 Income Loss"),
+        'lower_markers': ("income_loss_grp_converted",),
+        'category': 'income_loss',
+        'row_contains': ('income_loss', 'incomeloss'),
+        'header_rows': 1,
+        'columns': [
+            ('keyword', ('income', 'type'), (), ()),
+            ('keyword', ('income',), ('qty', 'quantity'), ()),
+            ('keyword', ('income', 'unit'), (), ('price',)),
+            ('keyword', ('income', 'price'), (), ()),
+            ('keyword', ('income',), ('total', 'cost'), ()),
+        ],
+    },
+    'others': {
+        'markers': ("13.7 Others", "10.7 Others"),
+        'lower_markers': ("others_grp_converted",),
+        'category': 'others',
+        'row_contains': ('others',),
+        'header_rows': 1,
+        'columns': [
+            ('keyword', ('others', 'type'), (), ()),
+            ('keyword', ('others',), ('qty', 'quantity'), ()),
+            ('keyword', ('others', 'unit'), (), ('price',)),
+            ('keyword', ('others', 'price'), (), ()),
+            ('keyword', ('others',), ('total', 'cost'), ()),
+        ],
+    },
+}
+
+# Header text that marks the bus_info_needs table, which is filled as a whole
+BUS_INFO_NEEDS_MARKERS = (
+    '{bus_info_needs}',
+    'What types of information would be helpful',
+    'Information Needs',
+)
+
+
+def is_filled(value):
+    """True for values a 'Please Specify' column should show"""
+    return bool(value) and str(value).strip().lower() not in ['', 'nan']
+
+
+class TableSpec:
+    """A TABLE_SPECS entry compiled into a per-row formatter"""
+
+    def __init__(self, kind, spec):
+        self.kind = kind
+        self.markers = spec['markers']
+        self.lower_markers = spec.get('lower_markers', ())
+        self.category = spec['category']
+        self.row_contains = tuple(spec.get('row_contains', ()))
+        self.row_prefixes = tuple(spec.get('row_prefixes', ()))
+        self.header_rows = spec['header_rows']
+
+        self._formatters = []
+        self._keyword_rules = []
+        self.image_columns = []
+        for column, binding in enumerate(spec['columns']):
+            self._formatters.append(self._compile_binding(column, binding))
+
+        # Field name -> keyword column, resolved the first time a field is seen
+        self._keyword_columns = {}
+
+    def matches(self, first_two_rows_text, lowered_text):
+        return (any(marker in first_two_rows_text for marker in self.markers)
+                or any(marker in lowered_text for marker in self.lower_markers))
+
+    def _compile_binding(self, column, binding):
+        if isinstance(binding, str):
+            return lambda row, idx: str(row.get(binding, ''))
+
+        rule = binding[0]
+        if rule == 'index':
+            return lambda row, idx: str(idx)
+        if rule == 'specify':
+            _, field, other_field, separator = binding
+
+            def specify(row, idx):
+                value = row.get(field, '')
+                other = row.get(other_field, '')
+                return f"{value}{separator}{other}" if is_filled(other) else str(value)
+            return specify
+        if rule == 'format':
+            template = self._compile_template(binding[1])
+            if len(binding) < 3:
+                return template
+            strip = binding[2]
+            return lambda row, idx: template(row, idx).strip(strip)
+        if rule == 'parts':
+            _, separator, pieces = binding
+            pieces = [(self._compile_template(text), condition) for text, condition in pieces]
+
+            def parts(row, idx):
+                filled = []
+                for template, condition in pieces:
+                    if condition is None:
+                        text = template(row, idx)
+                        if is_filled(text):
+                            filled.append(text)
+                    elif is_filled(row.get(condition, '')):
+                        filled.append(template(row, idx))
+                return separator.join(filled)
+            return parts
+        if rule == 'keyword':
+            self._keyword_rules.append((column, binding[1], binding[2], binding[3]))
+            return None
+        if rule == 'images':
+            self.image_columns.append((column, binding[1]))
+            return None
+        raise ValueError(f"Unknown column binding {binding!r} in table spec '{self.kind}'")
+
+    @staticmethod
+    def _compile_template(text):
+        """Pre-split a '{field}' template into literal and field chunks"""
+        chunks = [(literal, field) for literal, field, _, _ in string.Formatter().parse(text)]
+
+        def render(row, idx):
+            return ''.join(literal + (str(row.get(field, '')) if field is not None else '')
+                           for literal, field in chunks)
+        return render
+
+    def _keyword_column(self, field):
+        column = self._keyword_columns.get(field, -1)
+        if column == -1:
+            column = None
+            lowered = field.lower()
+            for rule_column, all_of, any_of, none_of in self._keyword_rules:
+                if (all(word in lowered for word in all_of)
+                        and (not any_of or any(word in lowered for word in any_of))
+                        and not any(word in lowered for word in none_of)):
+                    column = rule_column
+                    break
+            self._keyword_columns[field] = column
+        return column
+
+    def format_row(self, row, idx):
+        """Cell texts of one data row; None for cells that are not plain text"""
+        values = [formatter(row, idx) if formatter is not None else None for formatter in self._formatters]
+        if self._keyword_rules:
+            for rule_column, _, _, _ in self._keyword_rules:
+                values[rule_column] = ""
+            for field, value in row.items():
+                if value:
+                    column = self._keyword_column(field)
+                    if column is not None:
+                        values[column] = str(value)
+        return values
+
+
+class RowSchema:
+    """Column names shared by every row of one additional file"""
+
+    def __init__(self, names):
+        # Duplicate headers keep their first position and their last value, like a dict
+        self.positions = {name: position for position, name in enumerate(names)}
+        self.names = tuple(dict.fromkeys(names))
+        self.ordered_positions = tuple(self.positions[name] for name in self.names)
+
+
+class AdditionalRow(Mapping):
+    """Read-only {header: value} view of one additional-data row stored as a tuple"""
+
+    __slots__ = ('schema', '_values')
+
+    def __init__(self, schema, values):
+        self.schema = schema
+        self._values = values
+
+    def __getitem__(self, name):
+        return self._values[self.schema.positions[name]]
+
+    def get(self, name, default=None):
+        position = self.schema.positions.get(name)
+        return default if position is None else self._values[position]
+
+    def __contains__(self, name):
+        return name in self.schema.positions
+
+    def __iter__(self):
+        return iter(self.schema.names)
+
+    def __len__(self):
+        return len(self.schema.names)
+
+    def keys(self):
+        return self.schema.names
+
+    def items(self):
+        values = self._values
+        return [(name, values[position]) for name, position in zip(self.schema.names, self.schema.ordered_positions)]
+
+
+class PlaceholderEngine:
+    """Single-pass placeholder substitution shared by paragraphs and table cells"""
+
+    # Innermost {name}, so "{a{b}" resolves {b} just like a plain str.replace would
+    PATTERN = re.compile(r'\{([^{}]+)\}')
+
+    def __init__(self, values):
+        # Stringify once per row instead of once per paragraph and key
+        self.values = {key: str(value) for key, value in values.items()}
+
+    def _resolve(self, match):
+        return self.values.get(match.group(1), match.group(0))
+
+    # Any leftover {...}, matching the historical clearing rule
+    LEFTOVER_PATTERN = re.compile(r'\{[^}]+\}')
+
+    def substitute(self, text):
+        """Replace every known placeholder in one scan; unknown ones are left as they are"""
+        if '{' not in text:
+            return text
+        return self.PATTERN.sub(self._resolve, text)
+
+    def render(self, text):
+        """Substitute known placeholders and drop the ones without a value"""
+        if '{' not in text:
+            return text
+        return self.clear(self.PATTERN.sub(self._resolve, text))
+
+    @classmethod
+    def clear(cls, text):
+        """Remove every remaining placeholder from a text"""
+        if '{' not in text:
+            return text
+        return cls.LEFTOVER_PATTERN.sub('', text)
+
+
+def init_cache_worker(size_limit):
+    """Process-pool initializer: apply the parent's cache size limit
+
+    Spawned workers re-import the module, so settings pushed by
+    RuntimeConfig.apply() are not inherited.
+    """
+    DiskCache.size_limit = size_limit
+
+
+def read_additional_file(file_path):
+    """Parse an additional workbook into (column names, {PARENT_KEY: [row tuples]})
+
+    Runs in a worker process, so it only returns plain picklable data. Files
+    without a PARENT_KEY column in row 4 give None.
+    """
+    df = ExcelCache.read(file_path, header=None)
+
+    # Find PARENT_KEY column in row 4 (index 3)
+    parent_key_col = None
+    if len(df) > 3:
+        for col_idx, cell_value in enumerate(df.iloc[3]):
+            if pd.notna(cell_value) and str(cell_value).strip().upper() == "PARENT_KEY":
+                parent_key_col = col_idx
+                break
+    if parent_key_col is None:
+        return None
+
+    # Get headers from row 4; unnamed columns are skipped
+    headers = df.iloc[3].tolist()
+    columns = [idx for idx, header in enumerate(headers) if pd.notna(header)]
+    names = [str(headers[idx]).strip() for idx in columns]
+
+    # Data rows (from row 5 onwards) that have a PARENT_KEY
+    data_rows = df.iloc[4:]
+    parent_keys = data_rows.iloc[:, parent_key_col]
+    has_key = parent_keys.notna().to_numpy()
+    data_rows = data_rows[has_key]
+    parent_keys = parent_keys[has_key].astype(str).str.strip()
+
+    # Blank out missing values in bulk
+    values = data_rows.iloc[:, columns]
+    values = values.astype(object).where(values.notna(), "")
+    records = [tuple(row) for row in values.to_numpy().tolist()]
+
+    # Group by PARENT_KEY for O(1) lookup, keeping file order within each key
+    groups = pd.Series(range(len(records))).groupby(parent_keys.to_numpy(), sort=False).indices
+    return names, {key_value: [records[position] for position in positions]
+                   for key_value, positions in groups.items()}
+
+
+def bounded_map(executor, func, jobs, window):
+    """Run func over jobs with at most window tasks in flight
+
+    Jobs are pulled from the iterable only as earlier tasks finish, and
+    (job, result) pairs are yielded in completion order, so pending futures
+    and finished results never pile up beyond the window.
+    """
+    jobs = iter(jobs)
+    pending = {}
+    for job in jobs:
+        pending[executor.submit(func, job)] = job
+        if len(pending) >= window:
+            break
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            job = pending.pop(future)
+            # Top the window back up before handing the result out
+            for next_job in jobs:
+                pending[executor.submit(func, next_job)] = next_job
+                break
+            yield job, future.result()
+
+
 class DocumentConverterTab:
     """Tab for document conversion with modern full-width design"""
 
-    def __init__(self, parent_frame):
+    # Dynamic table bindings, compiled once
+    table_specs = {kind: TableSpec(kind, spec) for kind, spec in TABLE_SPECS.items()}
+    row_categories = tuple(dict.fromkeys(spec.category for spec in table_specs.values()))
+
+    def __init__(self, parent_frame, runtime_config=None):
         self.parent_frame = parent_frame
+        self.runtime_config = runtime_config or RuntimeConfig()
         self.word_template_path = None
         self.excel_file_path = None
         self.additional_excel_paths = []
@@ -54,9 +1375,35 @@ class DocumentConverterTab:
         self._placeholders_cache = None
         self._additional_data_cache = {}
         self._column_mapping_cache = None
+        self._compiled_template = None
+        self._use_fast_render = False
+        self._use_process_pool = False
+        self._row_placeholders = ()
+        self._additional_loading = False
+        # Bumped per additional-file selection; results of older loads are dropped
+        self._additional_load_generation = 0
 
         self.setup_modern_fullwidth_ui()
 
+    @classmethod
+    def from_render_state(cls, state):
+        """Build a tab without UI that only renders rows, e.g. inside a worker process"""
+        tab = cls.__new__(cls)
+        tab.__dict__.update(state)
+        tab._compiled_template = tab._compile_template(tab.word_template_path)
+        return tab
+
+    def get_render_state(self):
+        """Picklable settings and data needed to render rows outside this tab"""
+        return {
+            'word_template_path': self.word_template_path,
+            'image_folder_path': self.image_folder_path,
+            'image_width': self.image_width,
+            '_additional_data_cache': self._additional_data_cache,
+            '_use_fast_render': self._use_fast_render,
+            '_row_placeholders': self._row_placeholders,
+        }
+
     def setup_modern_fullwidth_ui(self):
         # Configure parent frame
         self.parent_frame.configure(bg=ModernStyle.BACKGROUND)
@@ -135,6 +1482,34 @@ class DocumentConverterTab:
         image_settings_area = tk.Frame(processing_section, bg=ModernStyle.SURFACE)
         image_settings_area.pack(fill=tk.X, padx=20, pady=(20, 10))
 
+        # Fast mode only applies to templates with plain text placeholders
+        self.fast_mode_var = tk.BooleanVar(value=False)
+        fast_mode_check = tk.Checkbutton(
+            image_settings_area,
+            text="⚡ Fast text-only mode (templates without images or dynamic tables)",
+            variable=self.fast_mode_var,
+            font=font.Font(family="Segoe UI", size=9),
+            bg=ModernStyle.SURFACE,
+            fg=ModernStyle.TEXT_SECONDARY,
+            activebackground=ModernStyle.SURFACE,
+            anchor=tk.W
+        )
+        fast_mode_check.pack(fill=tk.X)
+
+        # Separate processes sidestep the GIL; a single core gains nothing from them
+        self.process_mode_var = tk.BooleanVar(value=(os.cpu_count() or 1) > 1)
+        process_mode_check = tk.Checkbutton(
+            image_settings_area,
+            text="🧩 Render on all CPU cores (separate processes)",
+            variable=self.process_mode_var,
+            font=font.Font(family="Segoe UI", size=9),
+            bg=ModernStyle.SURFACE,
+            fg=ModernStyle.TEXT_SECONDARY,
+            activebackground=ModernStyle.SURFACE,
+            anchor=tk.W
+        )
+        process_mode_check.pack(fill=tk.X)
+
         # Convert button area
         button_area = tk.Frame(processing_section, bg=ModernStyle.SURFACE)
         button_area.pack(fill=tk.X, padx=20, pady=20)
@@ -421,7 +1796,7 @@ class DocumentConverterTab:
     def upload_excel_file(self):
         file_path = filedialog.askopenfilename(
             title="Select Excel File",
-            filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+            filetypes=[("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("All files", "*.*")]
         )
         if file_path:
             self.excel_file_path = file_path
@@ -431,13 +1806,11 @@ class DocumentConverterTab:
     def upload_additional_files(self):
         file_paths = filedialog.askopenfilenames(
             title="Select Additional Excel Files",
-            filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+            filetypes=[("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("All files", "*.*")]
         )
         if file_paths:
             self.additional_excel_paths = list(file_paths)
-            self.update_file_status(self.additional_label, f"{len(file_paths)} files selected", True)
-            self._preload_additional_data()
-            self.check_ready_to_convert()
+            self._start_additional_data_load()
 
     def upload_image_folder(self):
         folder_path = filedialog.askdirectory(
@@ -452,7 +1825,7 @@ class DocumentConverterTab:
             self.update_file_status(self.image_label, f"{image_count} images found", True)
 
     def check_ready_to_convert(self):
-        if self.word_template_path and self.excel_file_path:
+        if self.word_template_path and self.excel_file_path and not self._additional_loading:
             self.convert_btn.configure(
                 state="normal",
                 bg=ModernStyle.BUTTON_PRIMARY,
@@ -481,54 +1854,144 @@ class DocumentConverterTab:
     def _preload_placeholders(self):
         """Pre-load placeholders from template for faster access"""
         try:
-            template_doc = Document(self.word_template_path)
-            self._placeholders_cache = self.find_placeholders(template_doc)
+            # Parse the template once; rows are rendered from in-memory clones
+            self._compiled_template = self._compile_template(self.word_template_path)
         except Exception as e:
+            self._compiled_template = None
             print(f"Error pre-loading placeholders: {e}")
 
-    def _preload_additional_data(self):
-        """Pre-load all additional data into memory for faster access"""
-        self._additional_data_cache = {}
+    def _start_additional_data_load(self):
+        """Load the selected additional files in the background, showing per-file progress
+
+        Selecting files again while a load runs starts a new load; the older
+        one finishes in the background and its result is discarded.
+        """
+        self._additional_load_generation += 1
+        generation = self._additional_load_generation
+        self._additional_loading = True
+        self.check_ready_to_convert()
+        file_paths = list(self.additional_excel_paths)
+        total = len(file_paths)
+
+        def is_current():
+            return generation == self._additional_load_generation
+
+        def show_progress(done, file_path):
+            if not is_current():
+                return
+            self.status_label.config(
+                text=f"📥 Loaded additional file {done} of {total}: {Path(file_path).name}",
+                fg=ModernStyle.PRIMARY
+            )
+            self.update_progress(done / total * 100)
+
+        def on_progress(done, file_path):
+            self.parent_frame.after(0, lambda: show_progress(done, file_path))
+
+        def on_finished(cache, failed, error=None):
+            if not is_current():
+                return
+            self._additional_data_cache = cache
+            self._additional_loading = False
+            self.update_progress(0)
+            if error is not None:
+                self.additional_label.configure(text="❌ Failed to load files", fg=ModernStyle.DANGER)
+                self.status_label.config(text="❌ Error loading additional files", fg=ModernStyle.DANGER)
+                messagebox.showerror("Error", f"Failed to load additional files:\n{error}")
+            elif failed:
+                names = ", ".join(Path(path).name for path in failed)
+                self.additional_label.configure(
+                    text=f"⚠️ {total - len(failed)} of {total} files loaded",
+                    fg=ModernStyle.WARNING
+                )
+                self.status_label.config(text=f"⚠️ Could not load: {names}", fg=ModernStyle.WARNING)
+            else:
+                self.update_file_status(self.additional_label, f"{total} files selected", True)
+                self.status_label.config(text="Ready to process your files", fg=ModernStyle.TEXT_SECONDARY)
+            self.check_ready_to_convert()
 
-        for file_path in self.additional_excel_paths:
+        def load_worker():
             try:
-                df = pd.read_excel(file_path, header=None)
-
-                # Find PARENT_KEY column in row 4 (index 3)
-                parent_key_col = None
-                if len(df) > 3:
-                    for col_idx, cell_value in enumerate(df.iloc[3]):
-                        if pd.notna(cell_value) and str(cell_value).strip().upper() == "PARENT_KEY":
-                            parent_key_col = col_idx
-                            break
-
-                if parent_key_col is not None:
-                    # Get headers from row 4
-                    headers = df.iloc[3].tolist()
-
-                    # Get data rows (from row 5 onwards)
-                    data_rows = df.iloc[4:]
+                cache, failed = self._preload_additional_data(file_paths, on_progress)
+            except Exception as e:
+                print(f"Error pre-loading additional files: {e}")
+                # e is cleared when the except block ends, before the callback runs
+                error = e
+                self.parent_frame.after(0, lambda: on_finished({}, file_paths, error))
+            else:
+                self.parent_frame.after(0, lambda: on_finished(cache, failed))
 
-                    # Group data by PARENT_KEY for O(1) lookup
-                    for _, row in data_rows.iterrows():
-                        if pd.notna(row.iloc[parent_key_col]):
-                            key_value = str(row.iloc[parent_key_col]).strip()
+        self.additional_label.configure(text=f"⏳ Loading {total} files...", fg=ModernStyle.ACCENT)
+        threading.Thread(target=load_worker, daemon=True).start()
 
-                            if key_value not in self._additional_data_cache:
-                                self._additional_data_cache[key_value] = []
+    def _preload_additional_data(self, file_paths, progress_callback=None):
+        """Load additional files into a new {PARENT_KEY: [rows]} cache
 
-                            # Create a dictionary mapping header to value
-                            row_data = {}
-                            for idx, header in enumerate(headers):
-                                if pd.notna(header):
-                                    row_data[str(header).strip()] = row.iloc[idx] if pd.notna(row.iloc[idx]) else ""
+        Returns (cache, failed_paths); files that could not be read are left
+        out of the cache and listed in failed_paths.
+        """
+        file_paths = list(file_paths)
+        results = [None] * len(file_paths)
+        errors = {}
 
-                            self._additional_data_cache[key_value].append(row_data)
+        def collect(position, load):
+            try:
+                results[position] = load()
+                errors.pop(position, None)
+            except BrokenProcessPool:
+                # The pool itself died (worker crashed or failed to start); not a bad file
+                raise
+            except Exception as e:
+                errors[position] = e
+                print(f"Error pre-loading additional file {file_paths[position]}: {e}")
 
+        if len(file_paths) > 1:
+            # Parse the workbooks in parallel; openpyxl parsing is CPU bound
+            done = 0
+            try:
+                max_workers = min(len(file_paths), self.runtime_config.worker_count(processes=True))
+                with ProcessPoolExecutor(max_workers=max_workers,
+                                         initializer=init_cache_worker,
+                                         initargs=(DiskCache.size_limit,)) as executor:
+                    futures = {executor.submit(read_additional_file, path): position
+                               for position, path in enumerate(file_paths)}
+                    for future in as_completed(futures):
+                        position = futures[future]
+                        collect(position, future.result)
+                        done += 1
+                        if progress_callback:
+                            progress_callback(done, file_paths[position])
             except Exception as e:
-                print(f"Error pre-loading additional file {file_path}: {e}")
+                # e.g. no process support here, or a worker died; finish in this thread
+                print(f"Parallel loading unavailable, loading sequentially: {e}")
+                for position, path in enumerate(file_paths):
+                    if results[position] is None and position not in errors:
+                        collect(position, lambda: read_additional_file(path))
+                        done += 1
+                        if progress_callback:
+                            progress_callback(done, path)
+        else:
+            for position, path in enumerate(file_paths):
+                collect(position, lambda: read_additional_file(path))
+                if progress_callback:
+                    progress_callback(position + 1, path)
+
+        # Merge in selection order so each key lists its rows file by file
+        cache = {}
+        for result in results:
+            if result is not None:
+                self._merge_additional_rows(cache, *result)
+        failed = [file_paths[position] for position in sorted(errors)]
+        return cache, failed
+
+    def _merge_additional_rows(self, cache, names, groups):
+        """Add one file's rows, grouped by PARENT_KEY, to a cache being built"""
+        # Rows are stored as tuples sharing one schema per file
+        schema = RowSchema(names)
+        for key_value, rows in groups.items():
+            cached = cache.setdefault(key_value, [])
+            cached.extend(AdditionalRow(schema, values) for values in rows)
 
-    @lru_cache(maxsize=1)
     def find_placeholders(self, doc=None):
         """Find all placeholders in the document like {firstname} - cached for performance"""
         if self._placeholders_cache:
@@ -536,7 +1999,9 @@ class DocumentConverterTab:
 
         placeholders = set()
 
-        if doc is None and self.word_template_path:
+        if doc is None and self._compiled_template:
+            doc = self._compiled_template.document
+        elif doc is None and self.word_template_path:
             doc = Document(self.word_template_path)
 
         # Search in paragraphs
@@ -562,206 +2027,234 @@ class DocumentConverterTab:
                     if cell.tables:
                         self._search_tables_for_placeholders(cell.tables, placeholders)
 
-    def find_column_mapping(self, df, placeholders):
-        """Find column mapping - cached for performance"""
-        if self._column_mapping_cache:
-            return self._column_mapping_cache
+    def _index_placeholder_locations(self, compiled):
+        """Record which paragraphs and tables hold placeholders so rows only visit those"""
+        document = compiled.document
+        index = []
 
-        column_mapping = {}
+        # Body paragraphs first, then tables - the order the render stages expect
+        for paragraph in document.paragraphs:
+            if '{' in paragraph.text:
+                index.append(('paragraph', compiled.element_path(paragraph._p)))
 
-        # Get all possible column values from rows 1, 2, 3, and 4 (index 0, 1, 2, 3)
-        search_rows = min(4, len(df))  # Search in first 4 rows
+        self._index_table_placeholder_locations(compiled, document.tables, index, False, top_level=True)
+        compiled.placeholder_index = index
 
-        for placeholder in placeholders:
-            found = False
-
-            # Search through each row (1, 2, 3, 4)
-            for row_idx in range(search_rows):
-                for col_idx, col_name in enumerate(df.columns):
-                    cell_value = df.iloc[row_idx, col_idx]
-
-                    # Check if entire cell content matches the placeholder (case-insensitive)
-                    if pd.notna(cell_value):
-                        cell_str = str(cell_value).strip()
-                        if cell_str.lower() == placeholder.lower():
-                            column_mapping[placeholder] = col_name
-                            found = True
-                            break
+    def _compile_template(self, template_path):
+        """Parse a template and scan it, reusing the on-disk cache for known templates"""
+        compiled = CompiledTemplate(template_path)
 
-                if found:
-                    break
-
-            if not found:
-                print(f"Warning: Placeholder '{placeholder}' not found in any of the first 4 rows")
+        cache_key = TemplateCache.key_for(compiled.content_hash)
+        cached = TemplateCache.load(cache_key)
+        if cached is not None:
+            compiled.restore_cache_state(cached)
+            self._placeholders_cache = cached['placeholders']
+            return compiled
 
-        self._column_mapping_cache = column_mapping
-        return column_mapping
+        self._placeholders_cache = None
+        self._placeholders_cache = self.find_placeholders(compiled.document)
+        self._index_placeholder_locations(compiled)
+        self._prepare_fast_render(compiled)
 
-    def replace_placeholders_optimized(self, doc, data_row):
-        """Optimized placeholder replacement using compiled regex with image support"""
-        # Pre-compile regex for better performance
-        placeholder_pattern = re.compile(r'\{([^}]+)\}')
+        state = compiled.get_cache_state()
+        state['placeholders'] = self._placeholders_cache
+        TemplateCache.store(cache_key, state)
+        return compiled
 
-        # Get image width setting
-        try:
-            image_width = float(self.image_width_var.get())
-        except:
-            image_width = 1.0
+    def _prepare_fast_render(self, compiled):
+        """Enable the raw-XML fast mode when the template only has text placeholders"""
+        compiled.fast_render_ready = False
 
-        # Process bus_info_needs ranking if present
-        if 'bus_info_needs' in data_row:
-            ranked_data = self.process_bus_info_needs_ranking(data_row)
-            data_row.update(ranked_data)
+        # Images need python-docx to add picture parts
+        if 'resp_pix' in (self._placeholders_cache or ()):
+            return
 
-        # Replace in paragraphs
-        for paragraph in doc.paragraphs:
-            original_text = paragraph.text
-            if '{' in original_text:  # Quick check before regex
-                # Check for image placeholder first
-                if self.image_folder_path and 'resp_pix' in data_row and '{resp_pix}' in original_text:
-                    image_filename = str(data_row.get('resp_pix', '')).strip()
-                    if image_filename and image_filename.lower() != 'nan':
-                        # Try different image extensions
-                        image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp']
-                        image_found = False
-
-                        for ext in [''] + image_extensions:  # Try without extension first, then with extensions
-                            if ext == '':
-                                test_filename = image_filename
-                            else:
-                                # Remove existing extension if any, then add new one
-                                base_name = os.path.splitext(image_filename)[0]
-                                test_filename = base_name + ext
-
-                            image_path = os.path.join(self.image_folder_path, test_filename)
-                            if os.path.exists(image_path):
-                                if self.replace_image_in_paragraph(paragraph, image_path, image_width, 'resp_pix'):
-                                    image_found = True
-                                    break
-
-                        if image_found:
-                            continue  # Skip text replacement if image was inserted
-
-                # Regular text replacement
-                new_text = original_text
-                for key, value in data_row.items():
-                    new_text = new_text.replace(f'{{{key}}}', str(value))
-                if new_text != original_text:
-                    paragraph.text = new_text
+        # Dynamic tables are rebuilt row by row, so they need the regular path too
+        if compiled.table_kinds:
+            return
 
-        # Replace in tables (including nested tables)
-        self._replace_in_tables_optimized(doc.tables, data_row, image_width)
+        try:
+            compiled.fast_render_ready = compiled.prepare_fast_render()
+        except Exception as e:
+            print(f"Fast mode unavailable for this template: {e}")
 
-    def process_bus_info_needs_ranking(self, data_row):
-        """Process bus_info_needs column to create ranked lists and reasons"""
-        bus_info_needs = str(data_row.get('bus_info_needs', '')).strip()
-        bus_info_needs_o = str(data_row.get('bus_info_needs_o', '')).strip()
+    def classify_table_at_load(self, table):
+        """Classify a template table from its header, with or without placeholder names"""
+        first_two_rows_text = ' '.join(cell.text for row in table.rows[:2] for cell in row.cells)
+        # Some headers are only marked by a placeholder name (e.g. {crops_grp_converted})
+        return (self.classify_dynamic_table(first_two_rows_text)
+                or self.classify_dynamic_table(PlaceholderEngine.clear(first_two_rows_text)))
 
-        # Initialize result dictionary
-        result = {}
+    def _index_table_placeholder_locations(self, compiled, tables, index, in_bus_table, top_level=False):
+        """Recursively index placeholder paragraphs of tables and nested tables"""
+        for table in tables:
+            is_bus_table = in_bus_table
+            if not in_bus_table:
+                # bus_info_needs tables are filled as a whole instead of per paragraph
+                table_text = ' '.join(cell.text for row in table.rows[:2] for cell in row.cells)
+                if self.is_bus_info_needs_table(table_text):
+                    index.append(('bus_table', compiled.element_path(table._tbl)))
+                    is_bus_table = True
+
+            role = 'bus_paragraph' if is_bus_table else 'paragraph'
+            seen_cells = set()
+            for row in table.rows:
+                for cell in row.cells:
+                    # Merged cells are returned once per grid column
+                    if cell._tc in seen_cells:
+                        continue
+                    seen_cells.add(cell._tc)
 
-        if not bus_info_needs or bus_info_needs.lower() in ['nan', 'na', '']:
-            # If no data, return empty strings for all placeholders
-            result['bus_info_needs'] = ''
-            result['bus_info_needs_rank'] = ''
-            for i in range(1, 10):
-                result[f'bus_info_needs_rank_reason{i}'] = ''
-            return result
+                    for paragraph in cell.paragraphs:
+                        if '{' in paragraph.text:
+                            index.append((role, compiled.element_path(paragraph._p)))
 
-        # Split the comma-separated values and clean them
-        items = [item.strip() for item in bus_info_needs.split(',') if item.strip()]
+                    if cell.tables:
+                        self._index_table_placeholder_locations(compiled, cell.tables, index, is_bus_table)
 
-        # Process items in order - the order determines the ranking
-        processed_items = []
-        for item in items:
-            item_clean = item.strip()
-            # Skip empty items and 'NA' entries
-            if item_clean and item_clean.lower() not in ['na', '']:
-                # Handle "Others, specify" case
-                if item_clean.lower() in ['others', 'specify']:
-                    if bus_info_needs_o and bus_info_needs_o.lower() not in ['nan', 'na', '']:
-                        processed_items.append(f"Others, specify: {bus_info_needs_o}")
-                    else:
-                        processed_items.append("Others, specify")
-                else:
-                    processed_items.append(item_clean)
+            # Top-level dynamic tables are filled after their own placeholders
+            if top_level and not is_bus_table:
+                kind = self.classify_table_at_load(table)
+                if kind is not None:
+                    path = compiled.element_path(table._tbl)
+                    compiled.table_kinds[tuple(path)] = kind
+                    index.append(('table', path))
 
-        # Create the ranked list output - each item on a new line
-        result['bus_info_needs'] = '\n'.join(processed_items)
+    def find_column_mapping(self, df, placeholders):
+        """Find column mapping - cached per template and workbook"""
+        cache_key = self._column_mapping_key()
+        if self._column_mapping_cache and self._column_mapping_cache[0] == cache_key:
+            return self._column_mapping_cache[1]
 
-        # Create rank numbers corresponding to each item
-        rank_numbers = [str(i) for i in range(1, len(processed_items) + 1)]
-        result['bus_info_needs_rank'] = '\n'.join(rank_numbers)
+        header_columns = self.header_column_index(df)
 
-        # Add individual reason placeholders (bus_info_needs_rank_reason1 to bus_info_needs_rank_reason9)
-        for i in range(1, 10):
-            reason_key = f'bus_info_needs_rank_reason{i}'
-            if i <= len(processed_items):
-                # Check if there's a corresponding reason in the data_row
-                if reason_key in data_row and str(data_row[reason_key]).strip() not in ['', 'nan', 'NA']:
-                    result[reason_key] = str(data_row[reason_key])
-                else:
-                    # Use the item itself as placeholder for the reason
-                    result[reason_key] = f"{{{reason_key}}}"
+        column_mapping = {}
+        for placeholder in placeholders:
+            # Entire cell content must match the placeholder (case-insensitive)
+            col_name = header_columns.get(placeholder.lower())
+            if col_name is not None:
+                column_mapping[placeholder] = col_name
             else:
-                result[reason_key] = ''
-
-        return result
+                print(f"Warning: Placeholder '{placeholder}' not found in any of the first 4 rows")
 
-    def replace_placeholders_optimized(self, doc, data_row):
-        """Optimized placeholder replacement using compiled regex with image support"""
-        # Pre-compile regex for better performance
-        placeholder_pattern = re.compile(r'\{([^}]+)\}')
+        self._column_mapping_cache = (cache_key, column_mapping)
+        return column_mapping
 
-        # Get image width setting
+    @staticmethod
+    def header_column_index(df):
+        """Lowercase header text in rows 1-4 -> column; the first occurrence in row order wins"""
+        header_columns = {}
+        for row_values in df.iloc[:4].to_numpy().tolist():
+            for col_name, cell_value in zip(df.columns, row_values):
+                if pd.notna(cell_value):
+                    header_columns.setdefault(str(cell_value).strip().lower(), col_name)
+        return header_columns
+
+    def plan_archives(self, df, data_rows, column_mapping):
+        """Work out how documents are split across output archives
+
+        Returns (row order, shard_of, expected) where shard_of(idx, position)
+        names the archive group of row idx finishing at the given position and
+        expected maps each group to its document count. Rows are ordered group
+        by group so every archive completes as early as possible.
+        """
+        total_rows = len(data_rows)
+        rule = self.runtime_config.archive_split_rule()
+
+        if rule is not None and rule[0] == 'count':
+            # Shards fill up in completion order
+            size = rule[1]
+            shard_count = max(1, -(-total_rows // size))
+            expected = {f"{number + 1:03d}": size for number in range(shard_count)}
+            expected[f"{shard_count:03d}"] = total_rows - size * (shard_count - 1)
+            return None, lambda idx, position: f"{position // size + 1:03d}", expected
+
+        if rule is not None and rule[0] == 'column':
+            header = rule[1]
+            col_name = column_mapping.get(header)
+            if col_name is None:
+                col_name = self.header_column_index(df).get(header.lower())
+            if col_name is None:
+                print(f"Warning: Archive group column '{header}' not found; writing a single archive")
+            else:
+                _, (texts,) = self.normalize_main_rows(data_rows, {header: col_name})
+                # Windows file names ignore case, so "Pob" and "POB" share one archive,
+                # named after the first spelling in the sheet
+                spellings = {}
+                groups = np.empty(total_rows, dtype=object)
+                groups[:] = [spellings.setdefault(group.casefold(), group)
+                             for group in map(self.clean_archive_group, texts)]
+                codes, _ = pd.factorize(groups)
+                expected = pd.Series(groups).value_counts(sort=False).to_dict()
+                return np.argsort(codes, kind='stable'), lambda idx, position: groups[idx], expected
+
+        return None, lambda idx, position: None, {None: total_rows}
+
+    @staticmethod
+    def clean_archive_group(text):
+        """Make a group value safe to use in an archive file name"""
+        text = str(text).strip()
+        for char in '<>:"/\\|?*':
+            text = text.replace(char, '_')
+        return text[:40] or "Unassigned"
+
+    def normalize_main_rows(self, data_rows, column_mapping):
+        """Ready-to-insert text of the main sheet's data rows: (placeholders, columns)
+
+        columns holds one text array per placeholder; zip(*columns) yields rows.
+
+        Missing values become "", floats holding whole numbers lose their ".0"
+        and everything else goes through str(), column by column.
+        """
+        column_texts = {}
+        for column_name in set(column_mapping.values()):
+            column = data_rows[column_name].astype(object)
+            texts = np.empty(len(column), dtype=object)
+            texts[:] = [str(value) for value in column.to_numpy()]
+
+            # Excel stores every number as a float: 3.0 should read "3"
+            kind = pd.api.types.infer_dtype(column, skipna=True)
+            if kind in ('string', 'empty', 'integer', 'boolean', 'datetime'):
+                is_float = None
+            else:
+                is_float = column.map(type).isin((float, np.float64)).to_numpy()
+            if is_float is not None and is_float.any():
+                floats = column[is_float].to_numpy(dtype=float)
+                with np.errstate(invalid='ignore'):  # NaN and inf are never whole
+                    whole = np.isfinite(floats) & (np.mod(floats, 1) == 0) & (np.abs(floats) < 2 ** 53)
+                positions = np.flatnonzero(is_float)[whole]
+                texts[positions] = [str(value) for value in floats[whole].astype(np.int64).tolist()]
+
+            texts[column.isna().to_numpy()] = ""
+            column_texts[column_name] = texts
+
+        placeholders = tuple(column_mapping)
+        columns = [column_texts[column_mapping[placeholder]] for placeholder in placeholders]
+        return placeholders, columns
+
+    def iter_document_jobs(self, data_rows, columns, key_column, order=None):
+        """Lazily yield one lightweight (idx, row values, key) job per main-sheet row
+
+        order optionally gives the row positions in the sequence to render them.
+        """
+        key_values = data_rows.iloc[:, key_column]
+        key_values = key_values.astype(object).where(key_values.notna(), "").to_numpy()
+        indexes = range(len(key_values))
+        if order is not None:
+            indexes = order.tolist()
+            columns = [column[order] for column in columns]
+            key_values = key_values[order]
+        yield from zip(indexes, zip(*columns), key_values)
+
+    def _column_mapping_key(self):
+        """Identify the template and workbook a column mapping was built for"""
+        template = self._compiled_template.content_hash if self._compiled_template else self.word_template_path
         try:
-            image_width = float(self.image_width_var.get())
-        except:
-            image_width = 1.0
-
-        # Process bus_info_needs ranking if present
-        if 'bus_info_needs' in data_row:
-            ranked_data = self.process_bus_info_needs_ranking(data_row)
-            data_row.update(ranked_data)
-
-        # Replace in paragraphs
-        for paragraph in doc.paragraphs:
-            original_text = paragraph.text
-            if '{' in original_text:  # Quick check before regex
-                # Check for image placeholder first
-                if self.image_folder_path and 'resp_pix' in data_row and '{resp_pix}' in original_text:
-                    image_filename = str(data_row.get('resp_pix', '')).strip()
-                    if image_filename and image_filename.lower() != 'nan':
-                        # Try different image extensions
-                        image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp']
-                        image_found = False
-
-                        for ext in [''] + image_extensions:  # Try without extension first, then with extensions
-                            if ext == '':
-                                test_filename = image_filename
-                            else:
-                                # Remove existing extension if any, then add new one
-                                base_name = os.path.splitext(image_filename)[0]
-                                test_filename = base_name + ext
-
-                            image_path = os.path.join(self.image_folder_path, test_filename)
-                            if os.path.exists(image_path):
-                                if self.replace_image_in_paragraph(paragraph, image_path, image_width, 'resp_pix'):
-                                    image_found = True
-                                    break
-
-                        if image_found:
-                            continue  # Skip text replacement if image was inserted
-
-                # Regular text replacement
-                new_text = original_text
-                for key, value in data_row.items():
-                    new_text = new_text.replace(f'{{{key}}}', str(value))
-                if new_text != original_text:
-                    paragraph.text = new_text
-
-        # Replace in tables (including nested tables)
-        self._replace_in_tables_optimized(doc.tables, data_row, image_width)
+            stat = os.stat(self.excel_file_path)
+            workbook = (os.path.abspath(self.excel_file_path), stat.st_size, stat.st_mtime_ns)
+        except (OSError, TypeError):
+            workbook = self.excel_file_path
+        return template, workbook
 
     def process_bus_info_needs_ranking(self, data_row):
         """Process bus_info_needs column to create ranked lists and reasons"""
@@ -819,177 +2312,110 @@ class DocumentConverterTab:
 
         return result
 
-    def replace_placeholders_optimized(self, doc, data_row):
-        """Optimized placeholder replacement using compiled regex with image support"""
-        # Pre-compile regex for better performance
-        placeholder_pattern = re.compile(r'\{([^}]+)\}')
-
-        # Get image width setting
-        try:
-            image_width = float(self.image_width_var.get())
-        except:
-            image_width = 1.0
-
+    def render_document(self, doc, data_row, additional_rows, locations):
+        """Render one row in a single pass over the indexed nodes of the cloned template
+
+        Placeholder replacement, dynamic table population, the hh_calc_total_sum
+        placeholder and clearing of leftover placeholders all happen while a node
+        is visited, instead of walking the whole document once per stage.
+        """
+        # Image width setting; never read from Tk here, rows render off the main thread
+        image_width = self.image_width
+
+        categorized_data, sum_values = self._prepare_row_values(data_row, additional_rows)
+
+        # A mapped hh_calc_total_sum column takes precedence over the computed sum
+        engine = PlaceholderEngine({**sum_values, **data_row})
+        sum_engine = PlaceholderEngine(sum_values)
+
+        # Only the nodes indexed at template load need a visit; body paragraphs
+        # come first, then table content in document order
+        for role, node in locations:
+            if role == 'paragraph':
+                self._replace_in_paragraph(node, data_row, engine, sum_engine, image_width)
+            elif role == 'bus_paragraph':
+                # bus_info_needs tables only get the sum, everything else is cleared
+                original_text = node.text
+                if '{' in original_text:
+                    node.text = sum_engine.render(original_text)
+            elif role == 'bus_table':
+                # Handle the entire bus_info_needs table
+                path, table = node
+                self.populate_bus_info_needs_table(table, data_row, path)
+            elif role == 'table' and categorized_data is not None:
+                kind, path, table = node
+                self.populate_dynamic_table(table, kind, categorized_data, path)
+
+    def _prepare_row_values(self, data_row, additional_rows):
+        """Add the bus_info_needs ranking to a row and derive its additional-data values"""
         # Process bus_info_needs ranking if present
         if 'bus_info_needs' in data_row:
             ranked_data = self.process_bus_info_needs_ranking(data_row)
             data_row.update(ranked_data)
 
-        # Replace in paragraphs
-        for paragraph in doc.paragraphs:
-            original_text = paragraph.text
-            if '{' in original_text:  # Quick check before regex
-                # Check for image placeholder first
-                if self.image_folder_path and 'resp_pix' in data_row and '{resp_pix}' in original_text:
-                    image_filename = str(data_row.get('resp_pix', '')).strip()
-                    if image_filename and image_filename.lower() != 'nan':
-                        # Try different image extensions
-                        image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp']
-                        image_found = False
-
-                        for ext in [''] + image_extensions:  # Try without extension first, then with extensions
-                            if ext == '':
-                                test_filename = image_filename
-                            else:
-                                # Remove existing extension if any, then add new one
-                                base_name = os.path.splitext(image_filename)[0]
-                                test_filename = base_name + ext
-
-                            image_path = os.path.join(self.image_folder_path, test_filename)
-                            if os.path.exists(image_path):
-                                if self.replace_image_in_paragraph(paragraph, image_path, image_width, 'resp_pix'):
-                                    image_found = True
-                                    break
-
-                        if image_found:
-                            continue  # Skip text replacement if image was inserted
-
-                # Regular text replacement
-                new_text = original_text
-                for key, value in data_row.items():
-                    new_text = new_text.replace(f'{{{key}}}', str(value))
-                if new_text != original_text:
-                    paragraph.text = new_text
+        # Table data and the income sum only depend on the additional rows
+        categorized_data = None
+        sum_values = {}
+        if additional_rows:
+            categorized_data, hh_calc_total_sum = self.categorize_additional_rows(additional_rows)
+            sum_values['hh_calc_total_sum'] = str(hh_calc_total_sum) if hh_calc_total_sum != 0 else "0"
 
-        # Replace in tables (including nested tables)
-        self._replace_in_tables_optimized(doc.tables, data_row, image_width)
+        return categorized_data, sum_values
 
-    def process_bus_info_needs_ranking(self, data_row):
-        """Process bus_info_needs column to create ranked lists and reasons"""
-        bus_info_needs = str(data_row.get('bus_info_needs', '')).strip()
-        bus_info_needs_o = str(data_row.get('bus_info_needs_o', '')).strip()
+    def render_document_fast(self, data_row, additional_rows):
+        """Render a text-only template straight from its document XML and return the .docx bytes"""
+        _, sum_values = self._prepare_row_values(data_row, additional_rows)
 
-        # Initialize result dictionary
-        result = {}
+        # Same precedence as render_document: row values win over the computed sum
+        return self._compiled_template.render_fast({**sum_values, **data_row})
 
-        if not bus_info_needs or bus_info_needs.lower() in ['nan', 'na', '']:
-            # If no data, return empty strings for all placeholders
-            result['bus_info_needs'] = ''
-            result['bus_info_needs_rank'] = ''
-            for i in range(1, 10):
-                result[f'bus_info_needs_rank_reason{i}'] = ''
-            return result
+    def _replace_in_paragraph(self, paragraph, data_row, engine, sum_engine, image_width):
+        """Replace placeholders in one paragraph, inserting resp_pix as an image"""
+        original_text = paragraph.text
+        if '{' not in original_text:  # Quick check before processing
+            return
 
-        # Split the comma-separated values and clean them
-        items = [item.strip() for item in bus_info_needs.split(',') if item.strip()]
+        # Check for image placeholder first
+        if self.image_folder_path and 'resp_pix' in data_row and '{resp_pix}' in original_text:
+            image_filename = str(data_row.get('resp_pix', '')).strip()
+            if image_filename and image_filename.lower() != 'nan':
+                # Try different image extensions
+                image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp']
 
-        # Process items in order - the order determines the ranking
-        processed_items = []
-        for item in items:
-            item_clean = item.strip()
-            # Skip empty items and 'NA' entries
-            if item_clean and item_clean.lower() not in ['na', '']:
-                # Handle "Others, specify" case
-                if item_clean.lower() in ['others', 'specify']:
-                    if bus_info_needs_o and bus_info_needs_o.lower() not in ['nan', 'na', '']:
-                        processed_items.append(f"Others, specify: {bus_info_needs_o}")
+                for ext in [''] + image_extensions:  # Try without extension first, then with extensions
+                    if ext == '':
+                        test_filename = image_filename
                     else:
-                        processed_items.append("Others, specify")
-                else:
-                    processed_items.append(item_clean)
-
-        # Create the ranked list output - each item on a new line
-        result['bus_info_needs'] = '\n'.join(processed_items)
-
-        # Create rank numbers corresponding to each item
-        rank_numbers = [str(i) for i in range(1, len(processed_items) + 1)]
-        result['bus_info_needs_rank'] = '\n'.join(rank_numbers)
-
-        # Add individual reason placeholders (bus_info_needs_rank_reason1 to bus_info_needs_rank_reason9)
-        for i in range(1, 10):
-            reason_key = f'bus_info_needs_rank_reason{i}'
-            if i <= len(processed_items):
-                # Check if there's a corresponding reason in the data_row
-                if reason_key in data_row and str(data_row[reason_key]).strip() not in ['', 'nan', 'NA']:
-                    result[reason_key] = str(data_row[reason_key])
-                else:
-                    # Use the item itself as placeholder for the reason
-                    result[reason_key] = f"{{{reason_key}}}"
-            else:
-                result[reason_key] = ''
-
-        return result
-
-    def replace_placeholders_optimized(self, doc, data_row):
-        """Optimized placeholder replacement using compiled regex with image support"""
-        # Pre-compile regex for better performance
-        placeholder_pattern = re.compile(r'\{([^}]+)\}')
-
-        # Get image width setting
-        try:
-            image_width = float(self.image_width_var.get())
-        except:
-            image_width = 1.0
-
-        # Process bus_info_needs ranking if present
-        if 'bus_info_needs' in data_row:
-            ranked_data = self.process_bus_info_needs_ranking(data_row)
-            data_row.update(ranked_data)
-
-        # Replace in paragraphs
-        for paragraph in doc.paragraphs:
-            original_text = paragraph.text
-            if '{' in original_text:  # Quick check before regex
-                # Check for image placeholder first
-                if self.image_folder_path and 'resp_pix' in data_row and '{resp_pix}' in original_text:
-                    image_filename = str(data_row.get('resp_pix', '')).strip()
-                    if image_filename and image_filename.lower() != 'nan':
-                        # Try different image extensions
-                        image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp']
-                        image_found = False
-
-                        for ext in [''] + image_extensions:  # Try without extension first, then with extensions
-                            if ext == '':
-                                test_filename = image_filename
-                            else:
-                                # Remove existing extension if any, then add new one
-                                base_name = os.path.splitext(image_filename)[0]
-                                test_filename = base_name + ext
-
-                            image_path = os.path.join(self.image_folder_path, test_filename)
-                            if os.path.exists(image_path):
-                                if self.replace_image_in_paragraph(paragraph, image_path, image_width, 'resp_pix'):
-                                    image_found = True
-                                    break
-
-                        if image_found:
-                            continue  # Skip text replacement if image was inserted
-
-                # Regular text replacement
-                new_text = original_text
-                for key, value in data_row.items():
-                    new_text = new_text.replace(f'{{{key}}}', str(value))
-                if new_text != original_text:
-                    paragraph.text = new_text
+                        # Remove existing extension if any, then add new one
+                        base_name = os.path.splitext(image_filename)[0]
+                        test_filename = base_name + ext
 
-        # Replace in tables (including nested tables)
-        self._replace_in_tables_optimized(doc.tables, data_row, image_width)
+                    image_path = os.path.join(self.image_folder_path, test_filename)
+                    if os.path.exists(image_path):
+                        if self.replace_image_in_paragraph(paragraph, image_path, image_width, 'resp_pix'):
+                            # Skip text replacement if image was inserted; only the
+                            # sum and the clearing still apply to the remaining text
+                            remaining_text = paragraph.text
+                            if '{' in remaining_text:
+                                paragraph.text = sum_engine.render(remaining_text)
+                            return
+
+        # Regular text replacement, dropping placeholders without a value
+        new_text = engine.render(original_text)
+        if new_text != original_text:
+            paragraph.text = new_text
 
     def replace_bus_info_needs_in_table_cell(self, cell, data_row):
         """Handle special replacement for bus_info_needs table cells"""
         # Process the ranking data first
         ranked_data = self.process_bus_info_needs_ranking(data_row)
 
+        # Reason placeholders come from the ranking only; everything else prefers
+        # the row's own values over the ranking
+        reason_engine = PlaceholderEngine({key: value for key, value in ranked_data.items()
+                                           if key.startswith('bus_info_needs_rank_reason')})
+        cell_engine = PlaceholderEngine({**ranked_data, **data_row})
+
         # Handle each paragraph in the cell
         for paragraph in cell.paragraphs:
             original_text = paragraph.text
@@ -1020,28 +2446,15 @@ class DocumentConverterTab:
 
             # Handle reason columns - replace individual reason placeholders
             elif '{bus_info_needs_rank_reason' in original_text:
-                new_text = original_text
-                for key, value in ranked_data.items():
-                    if key.startswith('bus_info_needs_rank_reason'):
-                        new_text = new_text.replace(f'{{{key}}}', str(value))
-                paragraph.text = new_text
+                paragraph.text = reason_engine.substitute(original_text)
 
             # Handle any other placeholders in this cell
             else:
-                new_text = original_text
-                # Replace regular placeholders first
-                for key, value in data_row.items():
-                    if f'{{{key}}}' in new_text:
-                        new_text = new_text.replace(f'{{{key}}}', str(value))
-                # Then replace ranking placeholders
-                for key, value in ranked_data.items():
-                    if f'{{{key}}}' in new_text:
-                        new_text = new_text.replace(f'{{{key}}}', str(value))
-
+                new_text = cell_engine.substitute(original_text)
                 if new_text != original_text:
                     paragraph.text = new_text
 
-    def populate_bus_info_needs_table(self, table, data_row):
+    def populate_bus_info_needs_table(self, table, data_row, path=None):
         """Populate the bus_info_needs table with ranked items in separate rows"""
         # Process the ranking data
         ranked_data = self.process_bus_info_needs_ranking(data_row)
@@ -1060,18 +2473,18 @@ class DocumentConverterTab:
 
         # Keep the header rows (typically first 2 rows) and remove any existing data rows
         header_rows = 2  # Adjust this based on your table structure
-        while len(table.rows) > header_rows:
-            table._tbl.remove(table.rows[-1]._tr)
+        filler = self.start_table_fill(table, header_rows, path)
 
         # Add a row for each item
         for i, item in enumerate(items, 1):
             if item.strip():  # Only add non-empty items
-                new_row = table.add_row()
-                cells = new_row.cells
+                cells = filler.add_row()
 
                 # Column 1: Item text
+                # Values are written final: leftover placeholders (e.g. unresolved
+                # reasons) are dropped here since nothing walks these rows afterwards
                 if len(cells) > 0:
-                    cells[0].text = item.strip()
+                    cells[0].text = PlaceholderEngine.clear(item.strip())
 
                 # Column 2: Rank number
                 if len(cells) > 1:
@@ -1081,71 +2494,26 @@ class DocumentConverterTab:
                 if len(cells) > 2:
                     reason_key = f'bus_info_needs_rank_reason{i}'
                     if reason_key in data_row and str(data_row[reason_key]).strip() not in ['', 'nan', 'NA']:
-                        cells[2].text = str(data_row[reason_key])
+                        cells[2].text = PlaceholderEngine.clear(str(data_row[reason_key]))
                     else:
                         cells[2].text = ''  # Leave empty for user to fill
 
-    def _replace_in_tables_optimized(self, tables, data_row, image_width=5.0):
-        """Optimized table replacement with image support"""
-        for table in tables:
-            # Check if this is a bus_info_needs table before processing individual cells
-            table_text = ' '.join(cell.text for row in table.rows[:2] for cell in row.cells)
+        filler.finish()
 
-            if self.is_bus_info_needs_table(table_text):
-                # Handle the entire bus_info_needs table
-                self.populate_bus_info_needs_table(table, data_row)
-                continue
+    def start_table_fill(self, table, header_rows, path=None):
+        """Clear a dynamic table's data rows and return a TableFiller for new ones
 
-            # Regular table processing for non-bus_info_needs tables
-            for row in table.rows:
-                for cell in row.cells:
-                    # Replace in cell paragraphs (more reliable than cell.text)
-                    for paragraph in cell.paragraphs:
-                        original_text = paragraph.text
-                        if '{' in original_text:  # Quick check before processing
-                            # Check for image placeholder first
-                            if self.image_folder_path and 'resp_pix' in data_row and '{resp_pix}' in original_text:
-                                image_filename = str(data_row.get('resp_pix', '')).strip()
-                                if image_filename and image_filename.lower() != 'nan':
-                                    # Try different image extensions
-                                    image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp']
-                                    image_found = False
-
-                                    for ext in [
-                                                   ''] + image_extensions:  # Try without extension first, then with extensions
-                                        if ext == '':
-                                            test_filename = image_filename
-                                        else:
-                                            # Remove existing extension if any, then add new one
-                                            base_name = os.path.splitext(image_filename)[0]
-                                            test_filename = base_name + ext
-
-                                        image_path = os.path.join(self.image_folder_path, test_filename)
-                                        if os.path.exists(image_path):
-                                            if self.replace_image_in_paragraph(paragraph, image_path, image_width,
-                                                                               'resp_pix'):
-                                                image_found = True
-                                                break
-
-                                    if image_found:
-                                        continue  # Skip text replacement if image was inserted
-
-                            # Regular text replacement
-                            new_text = original_text
-                            for key, value in data_row.items():
-                                new_text = new_text.replace(f'{{{key}}}', str(value))
-                            if new_text != original_text:
-                                paragraph.text = new_text
-
-                    # Handle nested tables in this cell
-                    if cell.tables:
-                        self._replace_in_tables_optimized(cell.tables, data_row, image_width)
+        path is the table's position in the template, used to reuse its prototype row.
+        """
+        if self._compiled_template is not None and path is not None:
+            prototype = self._compiled_template.row_prototype(path, header_rows)
+        else:
+            prototype = TableFiller.build_prototype(table._tbl, header_rows)
+        return TableFiller(table, prototype, header_rows)
 
     def is_bus_info_needs_table(self, text):
         """Check if this is the bus_info_needs table section"""
-        return ('{bus_info_needs}' in text or
-                'What types of information would be helpful' in text or
-                'Information Needs' in text)
+        return any(marker in text for marker in BUS_INFO_NEEDS_MARKERS)
 
     def replace_image_in_paragraph(self, paragraph, image_path, image_width, placeholder_name):
         """Replace placeholder with image in a paragraph"""
@@ -1188,12 +2556,17 @@ class DocumentConverterTab:
                 self.status_label.config(text="🔄 Initializing conversion...", fg=ModernStyle.PRIMARY)
                 self.update_progress(0)
 
-                destination_path = filedialog.askdirectory(title="Select Destination Folder for ZIP File")
+                destination_path = filedialog.askdirectory(title="Select Destination Folder")
                 if not destination_path:
                     self.status_label.config(text="Ready to process your files", fg=ModernStyle.TEXT_SECONDARY)
                     return
 
-                df = pd.read_excel(self.excel_file_path, header=None)
+                df = ExcelCache.read(self.excel_file_path, header=None)
+
+                # Template is normally compiled on upload; retry here so load errors surface
+                if self._compiled_template is None:
+                    self._compiled_template = self._compile_template(self.word_template_path)
+
                 placeholders = self._placeholders_cache or self.find_placeholders()
 
                 if not placeholders:
@@ -1218,65 +2591,99 @@ class DocumentConverterTab:
                     messagebox.showerror("Error", "KEY column not found in row 4 of main Excel file")
                     return
 
-                data_rows = df.iloc[4:].copy()
+                data_rows = df.iloc[4:]
 
                 if data_rows.empty:
                     messagebox.showwarning("Warning", "No data found starting from row 5")
                     return
 
-                temp_dir = Path(destination_path) / "temp_documents"
-                temp_dir.mkdir(exist_ok=True)
-
                 total_rows = len(data_rows)
-                generated_files = []
-
-                process_args = []
-                for idx, (original_row_idx, row) in enumerate(data_rows.iterrows()):
-                    process_args.append((idx, original_row_idx, row, column_mapping, key_column, temp_dir))
 
-                max_workers = min(4, os.cpu_count() or 1)
+                # Stringify and NaN-clean the mapped columns once for all rows
+                self._row_placeholders, columns = self.normalize_main_rows(data_rows, column_mapping)
+                order, shard_of, expected = self.plan_archives(df, data_rows, column_mapping)
+                jobs = self.iter_document_jobs(data_rows, columns, key_column, order)
+
+                # Worker count and in-flight window come from the Settings tab
+                render_state = None
+                max_workers = self.runtime_config.worker_count()
+                if self._use_process_pool:
+                    # Pickled once here; workers only receive the bytes. Its size counts
+                    # against free RAM because every process unpickles its own copy
+                    render_state = pickle.dumps(self.get_render_state(), protocol=pickle.HIGHEST_PROTOCOL)
+                    process_count = self.runtime_config.worker_count(processes=True,
+                                                                     state_size=len(render_state))
+                    if process_count > 1:
+                        max_workers = process_count
+                    else:
+                        reason = self.runtime_config.single_process_reason(len(render_state))
+                        print(f"Rendering with threads: {reason}")
+                        render_state = None
+
+                if render_state is not None:
+                    # Each process loads the template and additional data once, then
+                    # only receives row values and sends back the .docx bytes
+                    executor = ProcessPoolExecutor(max_workers=max_workers,
+                                                   initializer=init_render_worker,
+                                                   initargs=(render_state, DiskCache.size_limit))
+                    render = render_in_worker
+                else:
+                    executor = ThreadPoolExecutor(max_workers=max_workers)
+                    render = self.process_single_document
                 completed_count = 0
-
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    future_to_args = {executor.submit(self.process_single_document, args): args for args in
-                                      process_args}
-
-                    for future in as_completed(future_to_args):
-                        result, error = future.result()
+                window = max_workers * self.runtime_config.tasks_per_worker()
+
+                # Documents go from memory straight to their outputs as they finish; each
+                # output is written once, by its own thread
+                with executor, contextlib.ExitStack() as outputs:
+                    folder_writer = archives = None
+                    if self.runtime_config.writes_individual_files():
+                        folder_writer = outputs.enter_context(FolderWriter(destination_path, max_pending=window))
+                    if self.runtime_config.writes_zip():
+                        compression, compresslevel = self.runtime_config.zip_options()
+                        archives = outputs.enter_context(ArchiveSet(
+                            destination_path, "Generated_Documents", expected, compression, compresslevel,
+                            max_pending=window))
+
+                    results = bounded_map(executor, render, jobs, window)
+
+                    for job, (result, error) in results:
+                        group = shard_of(job[0], completed_count)
                         completed_count += 1
 
                         if result:
-                            generated_files.append(result)
+                            if folder_writer:
+                                folder_writer.add(*result)
+                            if archives:
+                                archives.add(group, *result)
                         else:
                             print(f"Error processing document: {error}")
+                            if archives:
+                                archives.skip(group)
 
-                        progress_value = (completed_count / total_rows) * 80
+                        progress_value = (completed_count / total_rows) * 95
                         self.update_progress(progress_value)
                         self.status_label.config(
                             text=f"📝 Processing document {completed_count} of {total_rows}",
                             fg=ModernStyle.PRIMARY
                         )
 
-                self.status_label.config(text="📦 Creating ZIP file...", fg=ModernStyle.ACCENT)
-                self.update_progress(85)
-
-                zip_path = Path(destination_path) / "Generated_Documents.zip"
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for file_path in generated_files:
-                        zipf.write(file_path, file_path.name)
-
-                for file_path in generated_files:
-                    if file_path.exists():
-                        file_path.unlink()
-                if temp_dir.exists():
-                    temp_dir.rmdir()
+                    # Leaving the block writes the last queued files and closes the archive
+                    self.status_label.config(text="📦 Finishing output files...", fg=ModernStyle.ACCENT)
 
                 self.update_progress(100)
                 self.status_label.config(
                     text=f"✅ Successfully generated {total_rows} documents!",
                     fg=ModernStyle.SUCCESS
                 )
-                messagebox.showinfo("Success", f"🎉 Generated {total_rows} documents in ZIP file:\n{zip_path}")
+                if archives and len(archives.paths) == 1:
+                    messagebox.showinfo("Success",
+                                        f"🎉 Generated {total_rows} documents in ZIP file:\n{archives.paths[0]}")
+                elif archives:
+                    messagebox.showinfo("Success", f"🎉 Generated {total_rows} documents in "
+                                                   f"{len(archives.paths)} ZIP files in:\n{destination_path}")
+                else:
+                    messagebox.showinfo("Success", f"🎉 Generated {total_rows} documents in:\n{destination_path}")
 
             except Exception as e:
                 print(f"Error occurred: {str(e)}")
@@ -1290,46 +2697,36 @@ class DocumentConverterTab:
                 ))
                 self.parent_frame.after(3100, self.reset_tab)
 
+        # Tk variables are read on the main thread
+        self._use_fast_render = self.fast_mode_var.get()
+        self._use_process_pool = self.process_mode_var.get()
         threading.Thread(target=conversion_worker, daemon=True).start()
 
     def get_additional_data_for_key_optimized(self, key_value):
         """Get all matching rows from pre-loaded cache - O(1) lookup"""
         return self._additional_data_cache.get(str(key_value).strip(), [])
 
-    def populate_dynamic_tables_optimized(self, doc, additional_rows):
-        """Optimized dynamic table population with pre-categorized data"""
-        # More comprehensive categorization with better debugging
-        categorized_data = {
-            'hh_member': [],
-            'labor': [],
-            'debt': [],
-            'land': [],
-            'struct': [],
-            'affected_struct': [],
-            'tree': [],
-            'crop': [],
-            'income_loss': [],
-            'others': []
-        }
+    def categorize_additional_rows(self, additional_rows):
+        """Split a row's additional data by table type and total hh_calc_total_inc"""
+        # One list per category named in TABLE_SPECS
+        categorized_data = {category: [] for category in self.row_categories}
 
         # Initialize totals for calculations
         hh_calc_total_sum = 0
 
-        # Categorize each row
+        # Categorize each row; rows of one file share a schema and so a category
+        schema_categories = {}
         for row in additional_rows:
-            row_keys = list(row.keys())
-
-            # Check for different patterns
-            if any('crop' in key.lower() for key in row_keys):
-                categorized_data['crop'].append(row)
-            elif any('income_loss' in key.lower() or 'incomeloss' in key.lower() for key in row_keys):
-                categorized_data['income_loss'].append(row)
-            elif any('others' in key.lower() for key in row_keys):
-                categorized_data['others'].append(row)
-            elif any(key.startswith('hhcomp_hhmmbr_') for key in row_keys):
-                categorized_data['hh_member'].append(row)
-            elif any(key.startswith(('hh_labor_', 'hh_wrk_', 'hh_calc_', 'hh_total_')) for key in row_keys):
-                categorized_data['labor'].append(row)
+            schema = row.schema if isinstance(row, AdditionalRow) else tuple(row.keys())
+            category = schema_categories.get(schema, False)
+            if category is False:
+                category = self._row_category(row.keys())
+                schema_categories[schema] = category
+            if category is None:
+                continue
+
+            categorized_data[category].append(row)
+            if category == 'labor':
                 # Calculate sum for hh_calc_total_inc
                 hh_calc_value = row.get('hh_calc_total_inc', 0)
                 if hh_calc_value and str(hh_calc_value).strip() and str(hh_calc_value).lower() != 'nan':
@@ -1337,136 +2734,70 @@ class DocumentConverterTab:
                         hh_calc_total_sum += float(hh_calc_value)
                     except (ValueError, TypeError):
                         pass  # Skip invalid values
-            elif any(key.startswith(('debt_', 'loan_', 'pymt_')) for key in row_keys):
-                categorized_data['debt'].append(row)
-            elif any(key.startswith('asset_land_') for key in row_keys):
-                categorized_data['land'].append(row)
-            elif any(key.startswith('asset_struct_') for key in row_keys):
-                categorized_data['struct'].append(row)
-            elif any(key.startswith('affctd_struct_') for key in row_keys):
-                categorized_data['affected_struct'].append(row)
-            elif any(key.startswith('tree_') for key in row_keys):
-                categorized_data['tree'].append(row)
-
-        # Process tables with optimized table identification
-        for table in doc.tables:
-            # Use more efficient table identification
-            first_two_rows_text = ' '.join(cell.text for row in table.rows[:2] for cell in row.cells)
-            # business and household main tables
-            if "Name of HH Member" in first_two_rows_text:
-                self.populate_hh_member_table(table, categorized_data['hh_member'])
-            elif "Ownership of at least one savings account" in first_two_rows_text:
-                self.populate_savings_table(table, categorized_data['hh_member'])
-            elif "Labor Force Status" in first_two_rows_text:
-                self.populate_labor_table(table, categorized_data['labor'])
-            elif "With formal loan contract? (Y/N)" in first_two_rows_text:
-                self.populate_debt_table(table, categorized_data['debt'])
-            elif "13.1 Affected Assets: Land" in first_two_rows_text or "10.0 Affected Assets: Land" in first_two_rows_text:
-                self.populate_land_assets_table(table, categorized_data['land'])
-            elif "13.2 Affected Assets: Structure" in first_two_rows_text or "10.2 Affected Assets: Structure" in first_two_rows_text:
-                self.populate_structure_assets_table(table, categorized_data['struct'])
-            elif "13.3 Affected Structure" in first_two_rows_text or "10.3 Affected Structure" in first_two_rows_text:
-                self.populate_affected_structure_table(table, categorized_data['affected_struct'])
-            elif "13.4 Trees" in first_two_rows_text or "10.4 Trees" in first_two_rows_text:
-                self.populate_trees_table(table, categorized_data['tree'])
-            elif "13.5 Crops" in first_two_rows_text or "10.5 Crops" in first_two_rows_text or "crops_grp_converted" in first_two_rows_text.lower():
-                self.populate_crops_table(table, categorized_data['crop'])
-            elif "13.6 Income Loss" in first_two_rows_text or "10.6 Income Loss" in first_two_rows_text or "income_loss_grp_converted" in first_two_rows_text.lower():
-                self.populate_income_loss_table(table, categorized_data['income_loss'])
-            elif "13.7 Others" in first_two_rows_text or "10.7 Others" in first_two_rows_text or "others_grp_converted" in first_two_rows_text.lower():
-                self.populate_others_table(table, categorized_data['others'])
-
-        # Replace the sum placeholder in the document
-        self.replace_sum_placeholder(doc, 'hh_calc_total_sum', hh_calc_total_sum)
-
-    def replace_sum_placeholder(self, doc, placeholder_name, sum_value):
-        """Replace sum placeholder in the entire document"""
-        placeholder_text = f"{{{placeholder_name}}}"
-        sum_text = str(sum_value) if sum_value != 0 else "0"
-
-        # Replace in paragraphs
-        for paragraph in doc.paragraphs:
-            if placeholder_text in paragraph.text:
-                paragraph.text = paragraph.text.replace(placeholder_text, sum_text)
-
-        # Replace in tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        if placeholder_text in paragraph.text:
-                            paragraph.text = paragraph.text.replace(placeholder_text, sum_text)
-
-                    # Handle nested tables
-                    if cell.tables:
-                        self._replace_sum_in_nested_tables(cell.tables, placeholder_text, sum_text)
-
-    def _replace_sum_in_nested_tables(self, tables, placeholder_text, sum_text):
-        """Replace sum placeholder in nested tables"""
-        for table in tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        if placeholder_text in paragraph.text:
-                            paragraph.text = paragraph.text.replace(placeholder_text, sum_text)
-
-                    # Handle further nested tables
-                    if cell.tables:
-                        self._replace_sum_in_nested_tables(cell.tables, placeholder_text, sum_text)
-
-    def clear_all_remaining_placeholders_optimized(self, doc):
-        """Optimized placeholder clearing with compiled regex"""
-        placeholder_pattern = re.compile(r'\{[^}]+\}')
-
-        # Clear placeholders in paragraphs
-        for paragraph in doc.paragraphs:
-            if '{' in paragraph.text:  # Quick check before regex
-                paragraph.text = placeholder_pattern.sub('', paragraph.text)
-
-        # Clear placeholders in tables (including nested tables)
-        self._clear_tables_placeholders_recursive_optimized(doc.tables, placeholder_pattern)
-
-    def _clear_tables_placeholders_recursive_optimized(self, tables, pattern):
-        """Optimized recursive placeholder clearing in tables"""
-        for table in tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        if '{' in paragraph.text:  # Quick check before regex
-                            paragraph.text = pattern.sub('', paragraph.text)
 
-                    # Handle nested tables in this cell
-                    if cell.tables:
-                        self._clear_tables_placeholders_recursive_optimized(cell.tables, pattern)
+        return categorized_data, hh_calc_total_sum
+
+    def _row_category(self, row_keys):
+        """Additional-data category of a row, from its column names and the specs' row rules"""
+        lowered_keys = [key.lower() for key in row_keys]
+        for spec in self.table_specs.values():
+            if any(word in key for word in spec.row_contains for key in lowered_keys):
+                return spec.category
+        for spec in self.table_specs.values():
+            if spec.row_prefixes and any(key.startswith(spec.row_prefixes) for key in row_keys):
+                return spec.category
+        return None
+
+    def classify_dynamic_table(self, first_two_rows_text):
+        """Return the dynamic table kind named by a table's header text, or None"""
+        lowered_text = first_two_rows_text.lower()
+        for kind, spec in self.table_specs.items():
+            if spec.matches(first_two_rows_text, lowered_text):
+                return kind
+        return None
+
+    def populate_dynamic_table(self, table, kind, categorized_data, path=None):
+        """Fill a dynamic table, classified at template load, with matching data"""
+        spec = self.table_specs[kind]
+        self.fill_table(table, spec, categorized_data[spec.category], path)
+
+    def fill_table(self, table, spec, additional_rows, path=None):
+        """Shared fill loop: one cloned row per data row, formatted by the table's spec"""
+        filler = self.start_table_fill(table, spec.header_rows, path)
+        for idx, row_data in enumerate(additional_rows, start=1):
+            cells = filler.add_row()
+            for cell, value in zip(cells, spec.format_row(row_data, idx)):
+                if value is not None:
+                    cell.text = value
+            for column, width in spec.image_columns:
+                if column < len(cells):
+                    # Insert images instead of text for Pix1-Pix10
+                    self.insert_images_in_cell(cells[column].cell, row_data, width)
+        filler.finish()
 
     def process_single_document(self, args):
-        """Process a single document - optimized for parallel processing with image support"""
+        """Render one row and return (filename, .docx bytes), or None and the error"""
         try:
-            idx, original_row_idx, row, column_mapping, key_column, temp_dir = args
-
-            # Create new document from template
-            new_doc = Document(self.word_template_path)
-
-            # Get KEY value for this row
-            key_value = row.iloc[key_column] if pd.notna(row.iloc[key_column]) else ""
+            idx, row_values, key_value = args
 
             # Get additional data from cache (O(1) lookup)
             additional_rows = self.get_additional_data_for_key_optimized(key_value)
 
-            # Prepare data for replacement (from main file)
-            replacement_data = {}
-            for placeholder, column_name in column_mapping.items():
-                replacement_data[placeholder] = row[column_name] if pd.notna(row[column_name]) else ""
+            # Data for replacement (from main file), already normalized
+            replacement_data = dict(zip(self._row_placeholders, row_values))
 
-            # Replace placeholders with optimized method (including images)
-            self.replace_placeholders_optimized(new_doc, replacement_data)
-
-            # Populate dynamic tables with additional data
-            if additional_rows:
-                self.populate_dynamic_tables_optimized(new_doc, additional_rows)
+            if self._use_fast_render and self._compiled_template.fast_render_ready:
+                # Text-only template: substitute straight into the document XML
+                new_doc = None
+                document_bytes = self.render_document_fast(replacement_data, additional_rows)
+            else:
+                # Clone the pre-parsed template instead of re-reading the .docx from disk
+                new_doc = self._compiled_template.new_document()
+                locations = self._compiled_template.locate_placeholders(new_doc)
 
-            # Clear any remaining placeholders in the entire document
-            self.clear_all_remaining_placeholders_optimized(new_doc)
+                # Replace placeholders (including images), fill dynamic tables and clear
+                # leftovers in one pass over the document
+                self.render_document(new_doc, replacement_data, additional_rows, locations)
 
             # Generate filename using pckg_brgy and resp_lname
             resp_lname = replacement_data.get('resp_lname', '')
@@ -1499,340 +2830,16 @@ class DocumentConverterTab:
                 # Final fallback to numbered naming
                 filename = f"document_{idx + 1:03d}.docx"
 
-            # Save document
-            output_path = temp_dir / filename
-            new_doc.save(output_path)
+            if new_doc is not None:
+                buffer = io.BytesIO()
+                new_doc.save(buffer)
+                document_bytes = buffer.getvalue()
 
-            return output_path, None
+            return (filename, document_bytes), None
 
         except Exception as e:
             return None, str(e)
 
-    def populate_hh_member_table(self, table, additional_rows):
-        """Populate the HH Member table with data from additional files"""
-        # Keep header rows and remove existing data rows (first row after headers)
-        while len(table.rows) > 2:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows
-        for idx, row_data in enumerate(additional_rows, start=1):
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            # Populate cells based on your table structure
-            if len(cells) > 0:
-                cells[0].text = str(idx)  # Row number
-            if len(cells) > 1:
-                # Full name (combining first, middle, last names)
-                fname = row_data.get('hhcomp_hhmmbr_fname', '')
-                mname = row_data.get('hhcomp_hhmmbr_mname', '')
-                lname = row_data.get('hhcomp_hhmmbr_lname', '')
-                full_name = f"{fname} {mname} {lname}".strip()
-                cells[1].text = full_name
-            if len(cells) > 2:
-                cells[2].text = str(row_data.get('hhcomp_hhmmbr_hhreltn', ''))
-            if len(cells) > 3:
-                cells[3].text = str(row_data.get('hhcomp_hhmmbr_hhage', ''))
-            if len(cells) > 4:
-                cells[4].text = str(row_data.get('hhcomp_hhmmbr_hhsex', ''))
-            if len(cells) > 5:
-                cells[5].text = str(row_data.get('hhcomp_hhmmbr_status', ''))
-            if len(cells) > 6:
-                religion = row_data.get('hhcomp_hhmmbr_relg', '')
-                religion_other = row_data.get('hhcomp_hhmmbr_relg_o', '')
-                if religion_other and str(religion_other).strip().lower() not in ['', 'nan']:
-                    cells[6].text = f"{religion} Pls. Specify: {religion_other}"
-                else:
-                    cells[6].text = str(religion)
-            if len(cells) > 7:
-                cells[7].text = str(row_data.get('hhcomp_hhmmbr_brtplc', ''))
-            if len(cells) > 8:
-                cells[8].text = str(row_data.get('hhcomp_hhmmbr_educ', ''))
-            if len(cells) > 9:
-                cells[9].text = str(row_data.get('hhcomp_hhmmbr_ethn', ''))
-
-    def populate_savings_table(self, table, additional_rows):
-        """Populate the savings account table with data from additional files"""
-        # Keep header rows and remove existing data rows
-        while len(table.rows) > 1:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows
-        for idx, row_data in enumerate(additional_rows, start=1):
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            if len(cells) > 0:
-                cells[0].text = str(idx)  # Row number
-            if len(cells) > 1:
-                cells[1].text = str(row_data.get('hhcomp_hhmmbr_ethn', ''))
-            if len(cells) > 2:
-                savings = row_data.get('hhcomp_hhmmbr_savings', '')
-                savings_o = row_data.get('hhcomp_hhmmbr_savings_o', '')
-                if savings_o and str(savings_o).strip().lower() not in ['', 'nan']:
-                    cells[2].text = f"{savings} Pls. Specify {savings_o}"
-                else:
-                    cells[2].text = str(savings)
-            if len(cells) > 3:
-                cells[3].text = str(row_data.get('hhcomp_hhmmbr_phone', ''))
-            if len(cells) > 4:
-                org = row_data.get('hhcomp_hhmmbr_org', '')
-                org_o = row_data.get('hhcomp_hhmmbr_org_o', '')
-                if org_o and str(org_o).strip().lower() not in ['', 'nan']:
-                    cells[4].text = f"{org} Pls. Specify {org_o}"
-                else:
-                    cells[4].text = str(org)
-            if len(cells) > 5:
-                cells[5].text = str(row_data.get('hhcomp_hhmmbr_org_mem', ''))
-            if len(cells) > 6:
-                cells[6].text = str(row_data.get('hhcomp_hhmmbr_disability', ''))
-
-    def populate_labor_table(self, table, additional_rows):
-        """Populate the Labor Force Status table with data from additional files"""
-        # Keep header rows and remove existing data rows
-        while len(table.rows) > 3:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows
-        for idx, row_data in enumerate(additional_rows, start=1):
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            if len(cells) > 0:
-                cells[0].text = str(idx)  # Row number
-            if len(cells) > 1:
-                cells[1].text = str(row_data.get('hh_labor_stat', ''))
-            if len(cells) > 2:
-                labor_pri = row_data.get('hh_labor_pri_src', '')
-                labor_pri_o = row_data.get('hh_labor_pri_src_o', '')
-                if labor_pri_o and str(labor_pri_o).strip().lower() not in ['', 'nan']:
-                    cells[2].text = f"{labor_pri} Pls. Specify {labor_pri_o}"
-                else:
-                    cells[2].text = str(labor_pri)
-            if len(cells) > 3:
-                cells[3].text = str(row_data.get('hh_labor_pri_industry', ''))
-            if len(cells) > 4:
-                cells[4].text = str(row_data.get('hh_labor_pri_plc_work', ''))
-            if len(cells) > 5:
-                cells[5].text = str(row_data.get('hh_labor_pri_inc', ''))
-            if len(cells) > 6:
-                cells[6].text = str(row_data.get('hh_labor_occ_other', ''))
-            if len(cells) > 7:
-                cells[7].text = str(row_data.get('hh_labor_other_industry', ''))
-            if len(cells) > 8:
-                cells[8].text = str(row_data.get('hh_labor_occ_other_plc_wrk', ''))
-            if len(cells) > 9:
-                cells[9].text = str(row_data.get('hh_labor_occ_other_inc', ''))
-            if len(cells) > 10:
-                cells[10].text = str(row_data.get('hh_calc_total_inc', ''))
-            if len(cells) > 11:
-                cells[11].text = str(row_data.get('hh_wrk_hrs', ''))
-
-    def populate_debt_table(self, table, additional_rows):
-        """Populate the debt/loan table with data from additional files"""
-        # Keep header rows and remove existing data rows
-        while len(table.rows) > 1:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows
-        for idx, row_data in enumerate(additional_rows, start=1):
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            if len(cells) > 0:
-                debt_src_name = row_data.get('debt_src_name', '')
-                debt_src_name_o = row_data.get('debt_src_name_o', '')
-                if debt_src_name_o and str(debt_src_name_o).strip().lower() not in ['', 'nan']:
-                    cells[0].text = f"{debt_src_name} Pls. Specify {debt_src_name_o}"
-                else:
-                    cells[0].text = str(debt_src_name)
-            if len(cells) > 1:
-                cells[1].text = str(row_data.get('debt_contract', ''))
-            if len(cells) > 2:
-                cells[2].text = str(row_data.get('debt_contract_y', ''))
-            if len(cells) > 3:
-                cells[3].text = str(row_data.get('debt_amt', ''))
-            if len(cells) > 4:
-                loan_used = row_data.get('loan_used', '')
-                loan_used_o = row_data.get('loan_used_o', '')
-                if loan_used_o and str(loan_used_o).strip().lower() not in ['', 'nan']:
-                    cells[4].text = f"{loan_used} Pls. Specify {loan_used_o}"
-                else:
-                    cells[4].text = str(loan_used)
-            if len(cells) > 5:
-                pymt_terms = str(row_data.get('pymt_terms', ''))
-                pymt_terms_int = str(row_data.get('pymt_terms_int', ''))
-                pymt_terms_amt = str(row_data.get('pymt_terms_amt', ''))
-                pymt_terms_long = str(row_data.get('pymt_terms_long', ''))
-                payment_terms = f"{pymt_terms}{pymt_terms_int}{pymt_terms_amt}, {pymt_terms_long}"
-                cells[5].text = payment_terms
-            if len(cells) > 6:
-                cells[6].text = str(row_data.get('debt_balance', ''))
-            if len(cells) > 7:
-                cells[7].text = str(row_data.get('debt_fam_proc', ''))
-            if len(cells) > 8:
-                cells[8].text = str(row_data.get('debt_fam_payment', ''))
-
-    def populate_land_assets_table(self, table, additional_rows):
-        """Populate the land assets table with data from additional files"""
-        # Keep header rows and remove existing data rows
-        while len(table.rows) > 2:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows
-        for idx, row_data in enumerate(additional_rows, start=1):
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            if len(cells) > 0:
-                cells[0].text = str(idx)  # Row number
-            if len(cells) > 1:
-                cells[1].text = str(row_data.get('asset_land_area', ''))
-            if len(cells) > 2:
-                cells[2].text = str(row_data.get('asset_land_area_aff', ''))
-            if len(cells) > 3:
-                cells[3].text = str(row_data.get('asset_land_ext_impact', ''))
-            if len(cells) > 4:
-                cells[4].text = str(row_data.get('asset_land_type', ''))
-            if len(cells) > 5:
-                asset_land_use = row_data.get('asset_land_use', '')
-                asset_land_use_o = row_data.get('asset_land_use_o', '')
-                if asset_land_use_o and str(asset_land_use_o).strip().lower() not in ['', 'nan']:
-                    cells[5].text = f"{asset_land_use}, Please Specify {asset_land_use_o}"
-                else:
-                    cells[5].text = str(asset_land_use)
-            if len(cells) > 6:
-                asset_land_tenure_owner = row_data.get('asset_land_tenure_owner', '')
-                asset_land_tenure_owner_o = row_data.get('asset_land_tenure_owner_o', '')
-                if asset_land_tenure_owner_o and str(asset_land_tenure_owner_o).strip().lower() not in ['', 'nan']:
-                    cells[6].text = f"{asset_land_tenure_owner}, Please Specify {asset_land_tenure_owner_o}"
-                else:
-                    cells[6].text = str(asset_land_tenure_owner)
-            if len(cells) > 7:
-                asset_land_proof_owner = row_data.get('asset_land_proof_owner', '')
-                asset_land_proof_owner_o = row_data.get('asset_land_proof_owner_o', '')
-                if asset_land_proof_owner_o and str(asset_land_proof_owner_o).strip().lower() not in ['', 'nan']:
-                    cells[7].text = f"{asset_land_proof_owner}, Please Specify {asset_land_proof_owner_o}"
-                else:
-                    cells[7].text = str(asset_land_proof_owner)
-            if len(cells) > 8:
-                cells[8].text = str(row_data.get('asset_land_yrs_used', ''))
-            if len(cells) > 9:
-                cells[9].text = str(row_data.get('asset_land_price_prch', ''))
-            if len(cells) > 10:
-                asset_land_pymnt_trms = row_data.get('asset_land_pymnt_trms', '')
-                asset_land_pymnt_trms_o = row_data.get('asset_land_pymnt_trms_o', '')
-                if asset_land_pymnt_trms_o and str(asset_land_pymnt_trms_o).strip().lower() not in ['', 'nan']:
-                    cells[10].text = f"{asset_land_pymnt_trms}, Please Specify {asset_land_pymnt_trms_o}"
-                else:
-                    cells[10].text = str(asset_land_pymnt_trms)
-            if len(cells) > 11:
-                cells[11].text = str(row_data.get('asset_land_pymnt_amt', ''))
-
-    def populate_structure_assets_table(self, table, additional_rows):
-        """Populate the structure assets table with data from additional files"""
-        # Keep header rows and remove existing data rows
-        while len(table.rows) > 2:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows
-        for idx, row_data in enumerate(additional_rows, start=1):
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            if len(cells) > 0:
-                cells[0].text = str(idx)  # Row number
-            if len(cells) > 1:
-                cells[1].text = str(row_data.get('asset_struct_area', ''))
-            if len(cells) > 2:
-                cells[2].text = str(row_data.get('asset_struct_area_aff', ''))
-            if len(cells) > 3:
-                cells[3].text = str(row_data.get('asset_struct_ext_impact', ''))
-            if len(cells) > 4:
-                asset_struct_type = row_data.get('asset_struct_type', '')
-                asset_struct_type_oth = row_data.get('asset_struct_type_oth', '')
-                asset_struct_type_oth_o = row_data.get('asset_struct_type_oth_o', '')
-
-                type_parts = [asset_struct_type]
-                if asset_struct_type_oth and str(asset_struct_type_oth).strip().lower() not in ['', 'nan']:
-                    type_parts.append(f"Please Specify {asset_struct_type_oth}")
-                if asset_struct_type_oth_o and str(asset_struct_type_oth_o).strip().lower() not in ['', 'nan']:
-                    type_parts.append(str(asset_struct_type_oth))
-
-                cells[4].text = ", ".join([part for part in type_parts if part])
-            if len(cells) > 5:
-                asset_struct_use = row_data.get('asset_struct_use', '')
-                asset_struct_use_o = row_data.get('asset_struct_use_o', '')
-                if asset_struct_use_o and str(asset_struct_use_o).strip().lower() not in ['', 'nan']:
-                    cells[5].text = f"{asset_struct_use}, Please Specify {asset_struct_use_o}"
-                else:
-                    cells[5].text = str(asset_struct_use)
-            if len(cells) > 6:
-                asset_struct_tenure_owner = row_data.get('asset_struct_tenure_owner', '')
-                asset_struct_tenure_owner_o = row_data.get('asset_struct_tenure_owner_o', '')
-                if asset_struct_tenure_owner_o and str(asset_struct_tenure_owner_o).strip().lower() not in ['', 'nan']:
-                    cells[6].text = f"{asset_struct_tenure_owner}, Please Specify {asset_struct_tenure_owner_o}"
-                else:
-                    cells[6].text = str(asset_struct_tenure_owner)
-            if len(cells) > 7:
-                asset_struct_proof_owner = row_data.get('asset_struct_proof_owner', '')
-                asset_struct_proof_owner_o = row_data.get('asset_struct_proof_owner_o', '')
-                if asset_struct_proof_owner_o and str(asset_struct_proof_owner_o).strip().lower() not in ['', 'nan']:
-                    cells[7].text = f"{asset_struct_proof_owner}, Please Specify {asset_struct_proof_owner_o}"
-                else:
-                    cells[7].text = str(asset_struct_proof_owner)
-            if len(cells) > 8:
-                cells[8].text = str(row_data.get('asset_struct_yrs_used', ''))
-            if len(cells) > 9:
-                cells[9].text = str(row_data.get('asset_struct_price_prch', ''))
-            if len(cells) > 10:
-                asset_struct_pymnt_trms = row_data.get('asset_struct_pymnt_trms', '')
-                asset_struct_pymnt_trms_o = row_data.get('asset_struct_pymnt_trms_o', '')
-                if asset_struct_pymnt_trms_o and str(asset_struct_pymnt_trms_o).strip().lower() not in ['', 'nan']:
-                    cells[10].text = f"{asset_struct_pymnt_trms}, Please Specify {asset_struct_pymnt_trms_o}"
-                else:
-                    cells[10].text = str(asset_struct_pymnt_trms)
-            if len(cells) > 11:
-                cells[11].text = str(row_data.get('asset_struct_pymnt_amt', ''))
-            if len(cells) > 12:
-                cells[12].text = str(row_data.get('asset_struct_mrkt_val', ''))
-
-    def populate_affected_structure_table(self, table, additional_rows):
-        """Populate the affected structure table with data from additional files"""
-        # Keep header rows and remove existing data rows
-        while len(table.rows) > 2:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows
-        for idx, row_data in enumerate(additional_rows, start=1):
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            if len(cells) > 0:
-                affctd_struct_type_zz = row_data.get('affctd_struct_type_zz', '')
-                affctd_struct_type_zz_o = row_data.get('affctd_struct_type_zz_o', '')
-                if affctd_struct_type_zz_o and str(affctd_struct_type_zz_o).strip().lower() not in ['', 'nan']:
-                    cells[0].text = f"{affctd_struct_type_zz}, Please Specify {affctd_struct_type_zz_o}"
-                else:
-                    cells[0].text = str(affctd_struct_type_zz)
-            if len(cells) > 1:
-                cells[1].text = str(row_data.get('affctd_struct_mtrl_type', ''))
-            if len(cells) > 2:
-                cells[2].text = str(row_data.get('affctd_struct_dimension', ''))
-            if len(cells) > 3:
-                affctd_struct_unit = row_data.get('affctd_struct_unit', '')
-                affctd_struct_ht = row_data.get('affctd_struct_ht', '')
-                unit_parts = [str(affctd_struct_unit), str(affctd_struct_ht)]
-                cells[3].text = ", ".join(
-                    [part for part in unit_parts if part and str(part).strip().lower() not in ['', 'nan']])
-            if len(cells) > 4:
-                cells[4].text = str(row_data.get('affctd_struct_estvalue', ''))
-            if len(cells) > 5:
-                cells[5].text = str(row_data.get('affctd_struct_totalcost', ''))
-            if len(cells) > 6:
-                # Insert images instead of text for Pix1-Pix10
-                self.insert_images_in_cell(cells[6], row_data, 1.5)
-
     def insert_images_in_cell(self, cell, row_data, image_width):
         """Insert multiple images in a table cell from Pix1-Pix10 data in left-right layout"""
         # Clear the cell first
@@ -1920,157 +2927,6 @@ class DocumentConverterTab:
                     except Exception as e:
                         paragraph.add_run(f"[Error loading: {os.path.basename(right_image)}]")
 
-    def populate_trees_table(self, table, additional_rows):
-        """Populate the trees table with data from additional files"""
-        # Keep header rows and remove existing data rows
-        while len(table.rows) > 1:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows
-        for row_data in additional_rows:
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            if len(cells) > 0:
-                cells[0].text = str(row_data.get('tree_type', ''))
-            if len(cells) > 1:
-                tree_age = row_data.get('tree_age', '')
-                tree_height = row_data.get('tree_height', '')
-                age_height = f"{tree_age}, {tree_height}".strip(', ')
-                cells[1].text = age_height
-            if len(cells) > 2:
-                cells[2].text = str(row_data.get('tree_qty', ''))
-            if len(cells) > 3:
-                cells[3].text = str(row_data.get('tree_price', ''))
-            if len(cells) > 4:
-                cells[4].text = str(row_data.get('tree_totalcost', ''))
-
-    def populate_crops_table(self, table, additional_rows):
-        """Populate the crops table with data from additional files"""
-        # Keep header rows and remove existing data rows
-        while len(table.rows) > 1:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows using more flexible key matching
-        for idx, row_data in enumerate(additional_rows):
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            # Try to find the right keys by looking for any key containing these terms
-            crop_type = ""
-            crop_age = ""
-            crop_area = ""
-            crop_price = ""
-            crop_total = ""
-
-            for key, value in row_data.items():
-                key_lower = key.lower()
-                if 'crop' in key_lower and 'type' in key_lower and value:
-                    crop_type = str(value)
-                elif 'crop' in key_lower and 'age' in key_lower and value:
-                    crop_age = str(value)
-                elif 'crop' in key_lower and 'area' in key_lower and value:
-                    crop_area = str(value)
-                elif 'crop' in key_lower and 'price' in key_lower and value:
-                    crop_price = str(value)
-                elif 'crop' in key_lower and ('total' in key_lower or 'cost' in key_lower) and value:
-                    crop_total = str(value)
-
-            if len(cells) > 0:
-                cells[0].text = crop_type
-            if len(cells) > 1:
-                cells[1].text = crop_age
-            if len(cells) > 2:
-                cells[2].text = crop_area
-            if len(cells) > 3:
-                cells[3].text = crop_price
-            if len(cells) > 4:
-                cells[4].text = crop_total
-
-    def populate_income_loss_table(self, table, additional_rows):
-        """Populate the income loss table with data from additional files"""
-        # Keep header rows and remove existing data rows
-        while len(table.rows) > 1:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows using more flexible key matching
-        for idx, row_data in enumerate(additional_rows):
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            # Try to find the right keys by looking for any key containing these terms
-            loss_type = ""
-            loss_qty = ""
-            loss_unit = ""
-            loss_price = ""
-            loss_total = ""
-
-            for key, value in row_data.items():
-                key_lower = key.lower()
-                if 'income' in key_lower and 'type' in key_lower and value:
-                    loss_type = str(value)
-                elif 'income' in key_lower and ('qty' in key_lower or 'quantity' in key_lower) and value:
-                    loss_qty = str(value)
-                elif 'income' in key_lower and 'unit' in key_lower and 'price' not in key_lower and value:
-                    loss_unit = str(value)
-                elif 'income' in key_lower and 'price' in key_lower and value:
-                    loss_price = str(value)
-                elif 'income' in key_lower and ('total' in key_lower or 'cost' in key_lower) and value:
-                    loss_total = str(value)
-
-            if len(cells) > 0:
-                cells[0].text = loss_type
-            if len(cells) > 1:
-                cells[1].text = loss_qty
-            if len(cells) > 2:
-                cells[2].text = loss_unit
-            if len(cells) > 3:
-                cells[3].text = loss_price
-            if len(cells) > 4:
-                cells[4].text = loss_total
-
-    def populate_others_table(self, table, additional_rows):
-        """Populate the others table with data from additional files"""
-        # Keep header rows and remove existing data rows
-        while len(table.rows) > 1:  # Keep only the header row
-            table._tbl.remove(table.rows[-1]._tr)
-
-        # Add data rows using more flexible key matching
-        for idx, row_data in enumerate(additional_rows):
-            new_row = table.add_row()
-            cells = new_row.cells
-
-            # Try to find the right keys by looking for any key containing these terms
-            others_type = ""
-            others_qty = ""
-            others_unit = ""
-            others_price = ""
-            others_total = ""
-
-            for key, value in row_data.items():
-                key_lower = key.lower()
-                if 'others' in key_lower and 'type' in key_lower and value:
-                    others_type = str(value)
-                elif 'others' in key_lower and ('qty' in key_lower or 'quantity' in key_lower) and value:
-                    others_qty = str(value)
-                elif 'others' in key_lower and 'unit' in key_lower and 'price' not in key_lower and value:
-                    others_unit = str(value)
-                elif 'others' in key_lower and 'price' in key_lower and value:
-                    others_price = str(value)
-                elif 'others' in key_lower and ('total' in key_lower or 'cost' in key_lower) and value:
-                    others_total = str(value)
-
-            if len(cells) > 0:
-                cells[0].text = others_type
-            if len(cells) > 1:
-                cells[1].text = others_qty
-            if len(cells) > 2:
-                cells[2].text = others_unit
-            if len(cells) > 3:
-                cells[3].text = others_price
-            if len(cells) > 4:
-                cells[4].text = others_total
-
     def reset_tab(self):
         # Reset file paths and caches
         self.word_template_path = None
@@ -2080,6 +2936,11 @@ class DocumentConverterTab:
         self._placeholders_cache = None
         self._additional_data_cache = {}
         self._column_mapping_cache = None
+        self._compiled_template = None
+
+        # Drop the result of an additional-data load still running
+        self._additional_load_generation += 1
+        self._additional_loading = False
 
         # Reset status labels
         self.word_label.config(text="No file selected", fg=ModernStyle.TEXT_SECONDARY)
@@ -2102,11 +2963,32 @@ class DocumentConverterTab:
         self.convert_btn.unbind("<Leave>")
 
 
+# Headless renderer of the current process-pool worker
+_render_worker = None
+
+
+def init_render_worker(state, cache_size_limit=None):
+    """Process-pool initializer: compile the template and take the additional data once
+
+    state is the pickled get_render_state() of the converter tab;
+    cache_size_limit is the parent's DiskCache.size_limit.
+    """
+    global _render_worker
+    init_cache_worker(cache_size_limit)
+    _render_worker = DocumentConverterTab.from_render_state(pickle.loads(state))
+
+
+def render_in_worker(args):
+    """Render one row in a worker process; returns ((filename, .docx bytes), None) or (None, error)"""
+    return _render_worker.process_single_document(args)
+
+
 class SettingsTab:
     """Settings tab with modern full-width design"""
 
-    def __init__(self, parent_frame):
+    def __init__(self, parent_frame, runtime_config=None):
         self.parent_frame = parent_frame
+        self.runtime_config = runtime_config or RuntimeConfig()
         self.setup_modern_settings_ui()
 
     def setup_modern_settings_ui(self):
@@ -2140,16 +3022,36 @@ class SettingsTab:
 
         # Performance settings
         perf_section = self.create_settings_section(settings_grid, "🚀 Performance Settings", 0, 0)
-        self.create_setting_item(perf_section, "Processing Threads", "Number of parallel threads", "spinbox",
-                                 {"from_": 1, "to": 8, "value": "4"})
-        self.create_setting_item(perf_section, "Memory Usage", "Optimize memory consumption", "combobox",
-                                 {"values": ["Low", "Medium", "High"], "default": "Medium"})
+        max_threads = max(8, os.cpu_count() or 1)
+        self.threads_var = self.create_setting_item(
+            perf_section, "Processing Threads", "Number of parallel workers (Auto: from CPU cores and RAM)",
+            "spinbox", {"values": [RuntimeConfig.AUTO] + [str(n) for n in range(1, max_threads + 1)],
+                        "value": RuntimeConfig.AUTO})
+        self.memory_var = self.create_setting_item(
+            perf_section, "Memory Usage", "Documents in flight and cache size", "combobox",
+            {"values": list(RuntimeConfig.MEMORY_CHOICES), "default": RuntimeConfig.AUTO})
+
+        # Every change goes straight to the shared runtime configuration
+        self.threads_var.trace_add("write", lambda *args: self.runtime_config.set_threads(self.threads_var.get()))
+        self.memory_var.trace_add("write", lambda *args: self.runtime_config.set_memory(self.memory_var.get()))
 
         # Output settings
         output_section = self.create_settings_section(settings_grid, "📁 Output Settings", 0, 1)
-        self.create_setting_item(output_section, "Output Format", "How to save generated documents", "combobox",
-                                 {"values": ["Individual + ZIP", "ZIP Only", "Individual Only"],
-                                  "default": "Individual + ZIP"})
+        self.output_format_var = self.create_setting_item(
+            output_section, "Output Format", "How to save generated documents", "combobox",
+            {"values": list(RuntimeConfig.OUTPUT_FORMATS), "default": RuntimeConfig.DEFAULT_OUTPUT_FORMAT})
+        self.output_format_var.trace_add(
+            "write", lambda *args: self.runtime_config.set_output_format(self.output_format_var.get()))
+        self.archive_split_var = self.create_setting_item(
+            output_section, "Split ZIP Archives", "Separate archives, each ready as soon as it is complete",
+            "combobox", {"values": list(RuntimeConfig.ARCHIVE_SPLITS), "default": RuntimeConfig.DEFAULT_ARCHIVE_SPLIT})
+        self.archive_split_var.trace_add(
+            "write", lambda *args: self.runtime_config.set_archive_split(self.archive_split_var.get()))
+        self.zip_compression_var = self.create_setting_item(
+            output_section, "ZIP Compression", "Documents are already compressed; None is fastest", "combobox",
+            {"values": list(RuntimeConfig.ZIP_COMPRESSION), "default": RuntimeConfig.DEFAULT_ZIP_COMPRESSION})
+        self.zip_compression_var.trace_add(
+            "write", lambda *args: self.runtime_config.set_zip_compression(self.zip_compression_var.get()))
         # self.create_setting_item(output_section, "File Naming", "Document naming convention", "combobox", {"values": ["Numbered", "Key-based", "Custom"], "default": "Numbered"})
 
         # Cache settings
@@ -2233,12 +3135,15 @@ class SettingsTab:
         # Widget
         if widget_type == "spinbox":
             var = tk.StringVar(value=options.get("value", "1"))
+            if "values" in options:
+                range_options = {"values": options["values"]}
+            else:
+                range_options = {"from_": options["from_"], "to": options["to"]}
             widget = ttk.Spinbox(
                 item_frame,
-                from_=options["from_"],
-                to=options["to"],
                 textvariable=var,
-                width=12
+                width=12,
+                **range_options
             )
         elif widget_type == "combobox":
             var = tk.StringVar(value=options.get("default", ""))
@@ -2251,6 +3156,7 @@ class SettingsTab:
             )
 
         widget.pack(side=tk.RIGHT, padx=(10, 0))
+        return var
 
     def create_action_button(self, parent, text, command, color):
         """Create an action button"""
@@ -2286,13 +3192,20 @@ class SettingsTab:
         return button
 
     def clear_template_cache(self):
-        messagebox.showinfo("Cache Cleared", "✅ Template cache has been cleared successfully!")
+        removed = TemplateCache.clear()
+        messagebox.showinfo("Cache Cleared", f"✅ Template cache has been cleared successfully! ({removed} templates removed)")
 
     def clear_data_cache(self):
-        messagebox.showinfo("Cache Cleared", "✅ Data cache has been cleared successfully!")
+        removed = ExcelCache.clear()
+        messagebox.showinfo("Cache Cleared", f"✅ Data cache has been cleared successfully! ({removed} files removed)")
 
     def reset_settings(self):
         if messagebox.askyesno("Reset Settings", "Are you sure you want to reset all settings to default?"):
+            self.threads_var.set(RuntimeConfig.AUTO)
+            self.memory_var.set(RuntimeConfig.AUTO)
+            self.zip_compression_var.set(RuntimeConfig.DEFAULT_ZIP_COMPRESSION)
+            self.output_format_var.set(RuntimeConfig.DEFAULT_OUTPUT_FORMAT)
+            self.archive_split_var.set(RuntimeConfig.DEFAULT_ARCHIVE_SPLIT)
             messagebox.showinfo("Settings Reset", "✅ All settings have been reset to default values!")
 
 
@@ -2758,11 +3671,11 @@ class MainTablesConverterTab:
         """Load codes file functionality"""
         file_path = filedialog.askopenfilename(
             title="Select Codes File",
-            filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+            filetypes=[("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("All files", "*.*")]
         )
         if file_path:
             try:
-                self.codes_df = pd.read_excel(file_path)
+                self.codes_df = ExcelReader.read(file_path)
                 # Validate required columns
                 required_cols = ['list name', 'name', 'label::English']
                 missing_cols = [col for col in required_cols if col not in self.codes_df.columns]
@@ -2817,7 +3730,7 @@ class MainTablesConverterTab:
         # Multiple file selection
         file_paths = filedialog.askopenfilenames(
             title="Select Files to Convert",
-            filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+            filetypes=[("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"), ("All files", "*.*")]
         )
         if not file_paths:
             return
@@ -2831,7 +3744,7 @@ class MainTablesConverterTab:
             self.status_label.config(text=f"🔄 Processing {len(file_paths)} file(s)...", fg=ModernStyle.PRIMARY)
 
             for file_path in file_paths:
-                df = pd.read_excel(file_path, header=None, keep_default_na=False)
+                df = ExcelReader.read(file_path, header=None, keep_default_na=False)
                 headers = df.iloc[0].tolist()
                 converted = df.copy()
 
@@ -3050,10 +3963,11 @@ class AutoConverter:
         self.notebook.add(settings_frame, text="⚙️ Settings")
         self.notebook.add(help_frame, text="❓ Help")
 
-        # Initialize tab classes
+        # Initialize tab classes; the converter runs with the Settings tab's configuration
+        self.runtime_config = RuntimeConfig()
         self.main_tables_tab = MainTablesConverterTab(main_tables_frame)
-        self.converter_tab = DocumentConverterTab(converter_frame)
-        self.settings_tab = SettingsTab(settings_frame)
+        self.converter_tab = DocumentConverterTab(converter_frame, self.runtime_config)
+        self.settings_tab = SettingsTab(settings_frame, self.runtime_config)
         self.help_tab = HelpTab(help_frame)
 
 
@@ -3064,4 +3978,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the worker processes of the frozen (PyInstaller) build
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""Benchmark: load time of the Excel reader engines
+
+Times pd.read_excel with openpyxl (the pandas default), with calamine (when
+python-calamine is installed) and pd.read_csv on the same data, as used by
+ExcelReader.read(). Run from the repository root, either on a real export or
+on a generated one:
+
+    python benchmarks/bench_excel_readers.py path/to/export.xlsx
+    python benchmarks/bench_excel_readers.py --rows 200000 --columns 30
+"""
+import argparse
+import importlib.util
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def generate_export(path, rows, columns):
+    """Write a survey-like sheet: ids, short codes, free text and numbers"""
+    rng = np.random.default_rng(0)
+    data = {"PARENT_KEY": [f"uuid:{i:08d}" for i in range(rows)]}
+    for c in range(1, columns):
+        kind = c % 3
+        if kind == 0:
+            data[f"num_{c}"] = rng.integers(0, 10_000, rows)
+        elif kind == 1:
+            data[f"code_{c}"] = rng.choice(["A", "B", "C", "D", ""], rows)
+        else:
+            data[f"text_{c}"] = [f"answer {v}" for v in rng.integers(0, 1000, rows)]
+    pd.DataFrame(data).to_excel(path, index=False)
+
+
+def timed(load):
+    start = time.perf_counter()
+    df = load()
+    return df, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", help=".xlsx export to read (generated if omitted)")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--columns", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.path:
+            xlsx_path = Path(args.path)
+        else:
+            xlsx_path = Path(tmp) / "export.xlsx"
+            print(f"Generating {args.rows} rows x {args.columns} columns...")
+            generate_export(xlsx_path, args.rows, args.columns)
+        csv_path = Path(tmp) / "export.csv"
+        pd.read_excel(xlsx_path, dtype=str).to_csv(csv_path, index=False)
+
+        print(f"{xlsx_path.name}: {xlsx_path.stat().st_size / 2 ** 20:.1f} MiB .xlsx, "
+              f"{csv_path.stat().st_size / 2 ** 20:.1f} MiB as CSV")
+
+        frames = {}
+        frames["openpyxl"], seconds = timed(lambda: pd.read_excel(xlsx_path, engine="openpyxl"))
+        print(f"  openpyxl (pandas default) {seconds:8.2f}s")
+        if importlib.util.find_spec("python_calamine") is not None:
+            frames["calamine"], seconds = timed(lambda: pd.read_excel(xlsx_path, engine="calamine"))
+            print(f"  calamine                  {seconds:8.2f}s")
+        else:
+            print("  calamine                  (python-calamine not installed)")
+        _, seconds = timed(lambda: pd.read_csv(csv_path, low_memory=False))
+        print(f"  CSV                       {seconds:8.2f}s")
+
+        if "calamine" in frames:
+            try:
+                pd.testing.assert_frame_equal(frames["openpyxl"], frames["calamine"], check_dtype=False)
+                print("calamine and openpyxl results compare equal")
+            except AssertionError as e:
+                print(f"calamine and openpyxl results differ:\n{e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: clearing a template table's data rows
+
+Compares the old `while len(table.rows) > N` loop with TableFiller.reset_rows()
+on a 12-column table with 2 header rows. Run from the repository root:
+
+    python benchmarks/bench_reset_rows.py [--rows 500] [--repeat 5]
+"""
+import argparse
+import copy
+import importlib.util
+import time
+from pathlib import Path
+
+from docx import Document
+from docx.table import Table
+
+APP_PATH = Path(__file__).resolve().parent.parent / "Auto-Converter.py"
+
+
+def load_app():
+    spec = importlib.util.spec_from_file_location("auto_converter", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_table(columns, header_rows, data_rows):
+    doc = Document()
+    table = doc.add_table(rows=header_rows + data_rows, cols=columns)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"r{r}c{c}"
+    return doc, table
+
+
+def while_loop_reset(table, header_rows):
+    while len(table.rows) > header_rows:
+        table._tbl.remove(table.rows[-1]._tr)
+
+
+def best_of(repeat, template_tbl, parent, reset):
+    best = None
+    for _ in range(repeat):
+        tbl = copy.deepcopy(template_tbl)
+        start = time.perf_counter()
+        reset(tbl, parent)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500, help="data rows in the table")
+    parser.add_argument("--columns", type=int, default=12)
+    parser.add_argument("--header-rows", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = load_app()
+    doc, table = build_table(args.columns, args.header_rows, args.rows)
+    parent = table._parent
+
+    def old(tbl, parent):
+        while_loop_reset(Table(tbl, parent), args.header_rows)
+
+    def new(tbl, parent):
+        app.TableFiller.reset_rows(tbl, args.header_rows)
+
+    old_time = best_of(args.repeat, table._tbl, parent, old)
+    new_time = best_of(args.repeat, table._tbl, parent, new)
+
+    # Both must leave exactly the header rows behind
+    for reset in (old, new):
+        tbl = copy.deepcopy(table._tbl)
+        reset(tbl, parent)
+        assert len(tbl.tr_lst) == args.header_rows
+
+    print(f"{args.columns} columns, {args.header_rows} header rows, "
+          f"{args.rows} data rows (best of {args.repeat}):")
+    print(f"  while/len loop: {old_time * 1000:8.1f} ms")
+    print(f"  reset_rows:     {new_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()